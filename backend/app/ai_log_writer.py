@@ -0,0 +1,88 @@
+"""
+Write-behind queue for AI decision logs
+"""
+import asyncio
+import atexit
+from collections import deque
+from typing import Optional
+from sqlalchemy import insert
+from .database import SessionLocal
+from .models import AILog, utcnow
+from .logging_config import get_logger
+
+logger = get_logger("ai_logs")
+
+
+class AILogWriter:
+    """Buffers AILog rows and inserts them in batches off the request path"""
+
+    # Flush at least this often, or as soon as a full batch is waiting
+    FLUSH_INTERVAL = 0.2
+    BATCH_SIZE = 500
+
+    def __init__(self):
+        self._pending: deque = deque()
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        # Last resort if the app exits without running its shutdown
+        atexit.register(self._drain)
+
+    def enqueue(self, **values) -> None:
+        """Queue one AILog row (column name -> value); timestamped now"""
+        values.setdefault("created_at", utcnow())
+        self._pending.append(values)
+        if len(self._pending) >= self.BATCH_SIZE:
+            self._batch_ready.set()
+
+    def start(self) -> None:
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the flush loop and write whatever is still queued"""
+        if self._task:
+            # Let the loop finish its current insert instead of cancelling mid-write
+            self._stopping = True
+            self._batch_ready.set()
+            await self._task
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.FLUSH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Insert queued rows in FIFO order, BATCH_SIZE per statement"""
+        while self._pending:
+            await asyncio.to_thread(self._insert, self._take_batch())
+
+    def _take_batch(self) -> list:
+        return [self._pending.popleft() for _ in range(min(len(self._pending), self.BATCH_SIZE))]
+
+    @staticmethod
+    def _insert(batch: list) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(AILog), batch)
+            db.commit()
+        except Exception:
+            db.rollback()
+            logger.exception("Failed to write %d AI log rows", len(batch))
+        finally:
+            db.close()
+
+    def _drain(self) -> None:
+        """Write anything still queued, synchronously (interpreter exit)"""
+        while self._pending:
+            self._insert(self._take_batch())
+
+
+# Global writer instance
+ai_log_writer = AILogWriter()
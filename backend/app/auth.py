@@ -2,9 +2,16 @@
 JWT Authentication for ReliefLink
 Handles token creation, validation, and user dependency injection
 """
+import asyncio
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-from jose import JWTError, jwt
+from typing import NamedTuple, Optional
+from cachetools import TTLCache
+import jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -17,14 +24,41 @@ from .logging_config import get_logger
 
 logger = get_logger("auth")
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Resolved once at import; these are read on every token encode/decode
+settings = get_settings()
+_SECRET_KEY = settings.SECRET_KEY
+_ALGORITHM = settings.ALGORITHM
+_ALGORITHMS = [settings.ALGORITHM]
+_ACCESS_TOKEN_EXPIRE = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
 
-# Bearer token scheme
+# Password hashing
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    deprecated="auto",
+)
+
+# Dedicated executor for CPU-bound bcrypt work, sized to the core count so
+# login spikes can't starve the threadpool used for DB I/O (see lifespan)
+_bcrypt_pool: Optional[ThreadPoolExecutor] = None
+
+# Bearer token scheme, shared by every auth dependency so FastAPI resolves
+# the Authorization header once per request
 security = HTTPBearer(auto_error=False)
 
+# Decoded-token cache: skips HMAC verify + claims parsing for repeat bearer tokens.
+# Keyed by a digest so raw tokens are not held in memory; entries are also
+# checked against the token's own `exp` claim.
+_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=60)
+_token_cache_lock = threading.Lock()
+
+# helper_id -> exists; saves a helpers lookup on every authenticated request
+_helper_exists_cache: TTLCache = TTLCache(maxsize=8192, ttl=30)
+_helper_exists_lock = threading.Lock()
+
 
-class TokenData(BaseModel):
+class TokenData(NamedTuple):
+    """Verified token claims; built after signature checks, so no validation needed"""
     helper_id: int
     name: str
     role: str = "helper"
@@ -44,29 +78,93 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def start_bcrypt_pool() -> None:
+    global _bcrypt_pool
+    if _bcrypt_pool is None:
+        _bcrypt_pool = ThreadPoolExecutor(
+            max_workers=os.cpu_count() or 1, thread_name_prefix="bcrypt"
+        )
+
+
+def shutdown_bcrypt_pool() -> None:
+    global _bcrypt_pool
+    if _bcrypt_pool is not None:
+        _bcrypt_pool.shutdown(wait=False)
+        _bcrypt_pool = None
+
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    """verify_password on the bcrypt pool (default executor if not started)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, verify_password, plain_password, hashed_password)
+
+
+async def aget_password_hash(password: str) -> str:
+    """get_password_hash on the bcrypt pool (default executor if not started)"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_bcrypt_pool, get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
-    settings = get_settings()
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + (
-        expires_delta or timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    )
+    expire = datetime.now(timezone.utc) + (expires_delta or _ACCESS_TOKEN_EXPIRE)
     to_encode.update({"exp": expire})
-    return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
+
+
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def decode_token(token: str) -> Optional[TokenData]:
-    settings = get_settings()
+    key = _token_key(token)
+    with _token_cache_lock:
+        cached = _token_cache.get(key)
+    if cached is not None:
+        token_data, exp_ts = cached
+        if exp_ts > time.time():
+            return token_data
+        invalidate_token(token)
+        return None
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _SECRET_KEY, algorithms=_ALGORITHMS)
         helper_id = payload.get("sub")
         name = payload.get("name", "")
         role = payload.get("role", "helper")
         if helper_id is None:
             return None
-        return TokenData(helper_id=int(helper_id), name=name, role=role)
-    except JWTError:
+        token_data = TokenData(helper_id=int(helper_id), name=name, role=role)
+    except jwt.InvalidTokenError:
         return None
 
+    with _token_cache_lock:
+        _token_cache[key] = (token_data, float(payload.get("exp", 0)))
+    return token_data
+
+
+def invalidate_token(token: str) -> None:
+    """Drop a token from the decode cache (e.g. on logout)"""
+    with _token_cache_lock:
+        _token_cache.pop(_token_key(token), None)
+
+
+def _helper_exists(db: Session, helper_id: int) -> bool:
+    with _helper_exists_lock:
+        exists = _helper_exists_cache.get(helper_id)
+    if exists is None:
+        from .models import Helper
+        exists = db.query(Helper.id).filter(Helper.id == helper_id).scalar() is not None
+        with _helper_exists_lock:
+            _helper_exists_cache[helper_id] = exists
+    return exists
+
+
+def invalidate_helper(helper_id: int) -> None:
+    """Forget the cached existence check for a helper (e.g. after deletion)"""
+    with _helper_exists_lock:
+        _helper_exists_cache.pop(helper_id, None)
+
 
 async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
@@ -82,15 +180,13 @@ async def get_current_user(
     if token_data is None:
         return None
     # Verify helper still exists
-    from .models import Helper
-    helper = db.query(Helper).filter(Helper.id == token_data.helper_id).first()
-    if not helper:
+    if not _helper_exists(db, token_data.helper_id):
         return None
     return token_data
 
 
 async def require_auth(
-    credentials: HTTPAuthorizationCredentials = Depends(HTTPBearer()),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
 ) -> TokenData:
     """
@@ -110,9 +206,7 @@ async def require_auth(
             detail="Invalid or expired token",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    from .models import Helper
-    helper = db.query(Helper).filter(Helper.id == token_data.helper_id).first()
-    if not helper:
+    if not _helper_exists(db, token_data.helper_id):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User no longer exists",
@@ -3,7 +3,7 @@ Application configuration using pydantic-settings
 Reads from .env file and environment variables
 """
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import lru_cache, cached_property
 import os
 
 
@@ -13,6 +13,7 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "relieflink-secret-key-change-in-production"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
+    BCRYPT_ROUNDS: int = 10  # log2 work factor; set to 4 in tests
 
     # Database
     DATABASE_URL: str = "sqlite:///./relieflink.db"
@@ -25,7 +26,7 @@ class Settings(BaseSettings):
     APP_NAME: str = "ReliefLink API"
     APP_VERSION: str = "2.0.0"
 
-    @property
+    @cached_property
     def cors_origins_list(self) -> list[str]:
         return [origin.strip() for origin in self.CORS_ORIGINS.split(",")]
 
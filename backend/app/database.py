@@ -2,8 +2,9 @@
 Database configuration for ReliefLink
 Using SQLite for MVP - PostgreSQL ready via DATABASE_URL env var
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, make_url
 from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy.pool import QueuePool
 import os
 
 from .config import get_settings
@@ -11,27 +12,66 @@ from .config import get_settings
 
 settings = get_settings()
 
+# Shared connection pool settings: keep connections (and their PRAGMA state)
+# alive across requests instead of reconnecting per session. Sync endpoints run
+# on anyio's 40-thread pool; the pool can grow to match so a worker thread never
+# sits on pool_timeout waiting for a connection
+POOL_OPTIONS = {
+    "poolclass": QueuePool,
+    "pool_size": 10,
+    "max_overflow": 30,
+    "pool_recycle": 3600,
+}
+
 # Resolve database path
 if settings.DATABASE_URL.startswith("sqlite"):
+    # Relative paths (the default ./relieflink.db) are relative to the backend
+    # directory, not the working directory; absolute ones are used as given
     BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-    DATABASE_URL = f"sqlite:///{os.path.join(BASE_DIR, '..', 'relieflink.db')}"
+    db_path = make_url(settings.DATABASE_URL).database or 'relieflink.db'
+    if not os.path.isabs(db_path):
+        db_path = os.path.join(BASE_DIR, '..', db_path)
+    DATABASE_URL = f"sqlite:///{db_path}"
     engine = create_engine(
         DATABASE_URL,
         connect_args={"check_same_thread": False},
-        echo=False
+        echo=False,
+        **POOL_OPTIONS
     )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_conn, _):
+        """WAL + relaxed sync: commits no longer fsync, readers don't block writers"""
+        cursor = dbapi_conn.cursor()
+        for pragma in (
+            "journal_mode=WAL",
+            "synchronous=NORMAL",
+            "temp_store=MEMORY",
+            "mmap_size=268435456",
+            "cache_size=-65536",
+        ):
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
 else:
     DATABASE_URL = settings.DATABASE_URL
-    engine = create_engine(DATABASE_URL, echo=False)
+    engine = create_engine(DATABASE_URL, echo=False, **POOL_OPTIONS)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# For endpoints that only read: nothing to flush, and nothing is ever committed
+# so loaded objects never need expiring
+ReadOnlySessionLocal = sessionmaker(
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine
+)
+
 
 # Modern declarative base (SQLAlchemy 2.0+)
 class Base(DeclarativeBase):
     pass
 
+# Sessions are synchronous: endpoints that only do DB work are plain `def` so
+# FastAPI runs them in its threadpool instead of on the event loop
 def get_db():
     """Dependency for getting database session"""
     db = SessionLocal()
@@ -40,6 +80,14 @@ def get_db():
     finally:
         db.close()
 
+def get_readonly_db():
+    """Dependency for read-only endpoints; the transaction is always rolled back"""
+    db = ReadOnlySessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
 def init_db():
     """Initialize database tables"""
     Base.metadata.create_all(bind=engine)
@@ -2,9 +2,9 @@
 Server-Sent Events (SSE) event bus for real-time updates
 """
 import asyncio
-import json
 from typing import AsyncGenerator
 from datetime import datetime, timezone
+import orjson
 from .logging_config import get_logger
 
 logger = get_logger("events")
@@ -13,37 +13,51 @@ logger = get_logger("events")
 class EventBus:
     """Simple pub/sub event bus for SSE streaming"""
 
+    # Per-subscriber backlog; slow clients lose their oldest events past this
+    QUEUE_MAXSIZE = 256
+
+    # An SSE comment is sent after this many idle seconds, so proxies keep the
+    # stream open and writes to half-open connections fail instead of hanging
+    HEARTBEAT_INTERVAL = 15.0
+    HEARTBEAT = b": ping\n\n"
+
     def __init__(self):
-        self._subscribers: list[asyncio.Queue] = []
+        # Each queue carries pre-framed SSE messages as bytes
+        self._subscribers: set[asyncio.Queue] = set()
 
-    async def subscribe(self) -> AsyncGenerator[str, None]:
-        """Subscribe to events. Yields SSE-formatted strings."""
-        queue: asyncio.Queue = asyncio.Queue()
-        self._subscribers.append(queue)
-        logger.info(f"New SSE subscriber (total: {len(self._subscribers)})")
+    async def subscribe(self) -> AsyncGenerator[bytes, None]:
+        """Subscribe to events. Yields SSE-formatted bytes, HEARTBEAT when idle."""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.QUEUE_MAXSIZE)
+        self._subscribers.add(queue)
+        logger.info("New SSE subscriber (total: %d)", len(self._subscribers))
         try:
             while True:
-                data = await queue.get()
+                try:
+                    data = await asyncio.wait_for(queue.get(), self.HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    data = self.HEARTBEAT
                 yield data
         except asyncio.CancelledError:
             pass
         finally:
-            self._subscribers.remove(queue)
-            logger.info(f"SSE subscriber disconnected (total: {len(self._subscribers)})")
+            self._subscribers.discard(queue)
+            logger.info("SSE subscriber disconnected (total: %d)", len(self._subscribers))
 
     async def publish(self, event_type: str, data: dict):
         """Publish an event to all subscribers"""
-        message = f"event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
-        disconnected = []
+        # Frame once; every subscriber gets the same bytes object
+        message = (
+            b"event: " + event_type.encode() + b"\ndata: "
+            + orjson.dumps(data, default=str) + b"\n\n"
+        )
         for queue in self._subscribers:
             try:
                 queue.put_nowait(message)
             except asyncio.QueueFull:
-                disconnected.append(queue)
-        # Clean up full queues
-        for q in disconnected:
-            if q in self._subscribers:
-                self._subscribers.remove(q)
+                # Slow consumer: drop its oldest event to make room
+                queue.get_nowait()
+                queue.put_nowait(message)
+                logger.warning("SSE subscriber %#x lagging, dropped oldest event", id(queue))
 
     @property
     def subscriber_count(self) -> int:
@@ -0,0 +1,103 @@
+"""
+In-memory grid of open requests for proximity lookups
+Buckets every status='requested' request into coarse lat/lon cells so
+"what's near me" checks a few cells instead of the whole table
+"""
+import math
+import threading
+from typing import Dict, List, NamedTuple, Tuple
+import numpy as np
+from cachetools import TTLCache
+from sqlalchemy.orm import Session
+
+from .models import HelpRequest
+from .utils import bounding_box, haversine_batch
+
+# 0.5 degree cells (~55km of latitude)
+CELL_DEG = 0.5
+
+# Rebuilt at most every TTL; writers that open/close requests or change their
+# priority call invalidate_open_requests() so this process sees it at once
+_grid_cache: TTLCache = TTLCache(maxsize=1, ttl=30)
+_grid_lock = threading.Lock()
+
+
+class OpenRequestGrid(NamedTuple):
+    ids: np.ndarray
+    latitude: np.ndarray
+    longitude: np.ndarray
+    priority: np.ndarray
+    cells: Dict[Tuple[int, int], List[int]]  # cell -> indexes into the arrays
+
+
+def _cell(lat: float, lon: float) -> Tuple[int, int]:
+    return math.floor(lat / CELL_DEG), math.floor(lon / CELL_DEG)
+
+
+def _build_grid(db: Session) -> OpenRequestGrid:
+    rows = db.query(HelpRequest).with_entities(
+        HelpRequest.id,
+        HelpRequest.latitude,
+        HelpRequest.longitude,
+        HelpRequest.priority_score,
+    ).filter(HelpRequest.status == 'requested').order_by(HelpRequest.id).all()
+    
+    n = len(rows)
+    cells: Dict[Tuple[int, int], List[int]] = {}
+    for i, r in enumerate(rows):
+        cells.setdefault(_cell(r.latitude, r.longitude), []).append(i)
+    
+    return OpenRequestGrid(
+        ids=np.fromiter((r.id for r in rows), dtype=np.int64, count=n),
+        latitude=np.fromiter((r.latitude for r in rows), dtype=np.float64, count=n),
+        longitude=np.fromiter((r.longitude for r in rows), dtype=np.float64, count=n),
+        priority=np.fromiter((r.priority_score or 0 for r in rows), dtype=np.float64, count=n),
+        cells=cells,
+    )
+
+
+def get_open_request_grid(db: Session) -> OpenRequestGrid:
+    with _grid_lock:
+        grid = _grid_cache.get('grid')
+    if grid is None:
+        grid = _build_grid(db)
+        with _grid_lock:
+            _grid_cache['grid'] = grid
+    return grid
+
+
+def nearby_open_requests(
+    db: Session,
+    lat: float,
+    lon: float,
+    radius_km: float
+) -> List[Tuple[int, float, float]]:
+    """
+    Open requests within radius_km of a point
+    Returns (request_id, distance_km, priority_score) tuples in id order
+    """
+    grid = get_open_request_grid(db)
+    
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    (lat_lo, lon_lo), (lat_hi, lon_hi) = _cell(min_lat, min_lon), _cell(max_lat, max_lon)
+    idx: List[int] = []
+    for cell_lat in range(lat_lo, lat_hi + 1):
+        for cell_lon in range(lon_lo, lon_hi + 1):
+            idx.extend(grid.cells.get((cell_lat, cell_lon), ()))
+    if not idx:
+        return []
+    idx.sort()
+    
+    distances = haversine_batch(lat, lon, grid.latitude[idx], grid.longitude[idx])
+    within = distances <= radius_km
+    return list(zip(
+        grid.ids[idx][within].tolist(),
+        distances[within].tolist(),
+        grid.priority[idx][within].tolist(),
+    ))
+
+
+def invalidate_open_requests() -> None:
+    """Drop the grid (after a request is created, accepted, closed or re-prioritised)"""
+    with _grid_lock:
+        _grid_cache.clear()
@@ -0,0 +1,64 @@
+"""
+Image processing for photo evidence uploads
+Resize + JPEG encode runs in a process pool so concurrent uploads use every core
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from PIL import Image, UnidentifiedImageError
+
+# Longest side of a stored image, in pixels
+IMAGE_MAX_DIM = 1024
+
+# Formats accepted by sniffing the data itself; the client's content type is
+# only a first filter
+ALLOWED_FORMATS = {"JPEG", "PNG", "WEBP"}
+
+# Started in the app lifespan; None means "use the default thread executor"
+_image_pool: Optional[ProcessPoolExecutor] = None
+
+
+def resize_and_save(raw: bytes, filepath: str) -> None:
+    """
+    Downscale an uploaded image to IMAGE_MAX_DIM and save it as JPEG (blocking)
+    Raises ValueError if the data is not a JPEG, PNG or WebP image
+    """
+    try:
+        img = Image.open(io.BytesIO(raw))
+    except UnidentifiedImageError:
+        raise ValueError("Unrecognized image data")
+    if img.format not in ALLOWED_FORMATS:
+        raise ValueError(f"Unsupported image format: {img.format}")
+    # JPEG: let the decoder downscale by 1/2, 1/4 or 1/8 first, so most of the
+    # IDCT work is skipped and LANCZOS only finishes the job (no-op for PNG/WebP)
+    img.draft(img.mode, (IMAGE_MAX_DIM, IMAGE_MAX_DIM))
+    img.thumbnail((IMAGE_MAX_DIM, IMAGE_MAX_DIM), Image.Resampling.LANCZOS)
+    img.save(filepath, "JPEG", quality=85)
+
+
+def start_image_pool() -> None:
+    global _image_pool
+    if _image_pool is None:
+        # forkserver: workers don't inherit the server's threads, locks or DB
+        # connections, and only need to import this module
+        _image_pool = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context("forkserver"),
+        )
+
+
+def shutdown_image_pool() -> None:
+    global _image_pool
+    if _image_pool is not None:
+        _image_pool.shutdown(wait=False, cancel_futures=True)
+        _image_pool = None
+
+
+async def aresize_and_save(raw: bytes, filepath: str) -> None:
+    """resize_and_save on the image pool (default executor if not started)"""
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(_image_pool, resize_and_save, raw, filepath)
@@ -3,7 +3,7 @@ Structured logging configuration for ReliefLink
 """
 import logging
 import sys
-from datetime import datetime
+from typing import Optional
 
 
 class ReliefLinkFormatter(logging.Formatter):
@@ -25,17 +25,22 @@ class ReliefLinkFormatter(logging.Formatter):
         "CRITICAL": "🚨"
     }
 
+    def __init__(self, use_color: Optional[bool] = None):
+        super().__init__(datefmt="%Y-%m-%d %H:%M:%S")
+        # ANSI colors only help on a terminal; skip them when piped to a log collector
+        self.use_color = sys.stdout.isatty() if use_color is None else use_color
+
     def format(self, record):
-        color = self.COLORS.get(record.levelname, "")
         icon = self.ICONS.get(record.levelname, "")
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        module = record.module[:15].ljust(15)
+        timestamp = self.formatTime(record, self.datefmt)
 
         formatted = (
-            f"{color}{icon} [{timestamp}] "
-            f"{record.levelname:8s} | {module} | "
-            f"{record.getMessage()}{self.RESET}"
+            f"{icon} [{timestamp}] "
+            f"{record.levelname:8s} | {record.module:<15.15} | "
+            f"{record.getMessage()}"
         )
+        if self.use_color:
+            formatted = f"{self.COLORS.get(record.levelname, '')}{formatted}{self.RESET}"
         if record.exc_info and record.exc_info[0]:
             formatted += f"\n{self.formatException(record.exc_info)}"
         return formatted
@@ -58,6 +63,7 @@ def setup_logging(debug: bool = False):
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
     logging.getLogger("httpcore").setLevel(logging.WARNING)
+    logging.getLogger("numba").setLevel(logging.WARNING)
 
 
 def get_logger(name: str) -> logging.Logger:
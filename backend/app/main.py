@@ -6,38 +6,94 @@ import asyncio
 import os
 from datetime import datetime, timedelta, timezone
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
+from sqlalchemy import update, case
 
 from .config import get_settings
 from .database import init_db, SessionLocal
+from .migrations import upgrade_schema
 from .models import HelpRequest
 from .logging_config import setup_logging, get_logger
 from .routers import requests, helpers, stats, ai, voice
+from .routers.stats import invalidate_stats
 from .events import event_bus
+from .auth import start_bcrypt_pool, shutdown_bcrypt_pool
+from .images import start_image_pool, shutdown_image_pool
+from .ai_log_writer import ai_log_writer
+from .services._kernels import warm_up as warm_up_kernels
 
 settings = get_settings()
 setup_logging(debug=settings.DEBUG)
 logger = get_logger("main")
 
+# Background task windows
+_CLEANUP_DELTA = timedelta(minutes=5)
+_ESCALATE_DELTA = timedelta(minutes=30)
+
+
+def _run_cleanup():
+    """Delete completed requests older than the cleanup window (blocking)"""
+    db = SessionLocal()
+    try:
+        cutoff_time = datetime.now(timezone.utc) - _CLEANUP_DELTA
+        deleted = db.query(HelpRequest).filter(
+            HelpRequest.status == 'completed',
+            HelpRequest.completed_at < cutoff_time
+        ).delete(synchronize_session=False)
+        db.commit()
+        if deleted > 0:
+            invalidate_stats()
+            logger.info("Auto-deleted %d completed request(s) older than 5 minutes", deleted)
+    finally:
+        db.close()
+
+
+def _run_escalation():
+    """Escalate unassigned requests older than the escalation window (blocking)"""
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        cutoff = now - _ESCALATE_DELTA
+        # Single UPDATE instead of loading and mutating each stale row
+        result = db.execute(
+            update(HelpRequest)
+            .where(
+                HelpRequest.status == 'requested',
+                HelpRequest.helper_id.is_(None),
+                HelpRequest.created_at < cutoff,
+                HelpRequest.escalation_level < 2
+            )
+            .values(
+                escalation_level=HelpRequest.escalation_level + 1,
+                escalated_at=now,
+                # Boost priority for escalated requests
+                ai_priority_score=case(
+                    (HelpRequest.ai_priority_score > 85, 100),
+                    (HelpRequest.ai_priority_score > 0, HelpRequest.ai_priority_score + 15),
+                    else_=HelpRequest.ai_priority_score
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            db.commit()
+            invalidate_stats()
+            logger.info("Escalated %d stale request(s)", result.rowcount)
+    finally:
+        db.close()
+
 
 async def cleanup_completed_requests():
     """Background task to delete completed requests after 5 minutes"""
     while True:
         try:
-            db = SessionLocal()
-            cutoff_time = datetime.now(timezone.utc) - timedelta(minutes=5)
-            deleted = db.query(HelpRequest).filter(
-                HelpRequest.status == 'completed',
-                HelpRequest.completed_at < cutoff_time
-            ).delete()
-            db.commit()
-            if deleted > 0:
-                logger.info(f"Auto-deleted {deleted} completed request(s) older than 5 minutes")
-            db.close()
+            # Run the blocking DB work off the event loop
+            await asyncio.to_thread(_run_cleanup)
         except Exception as e:
-            logger.error(f"Error in cleanup task: {e}")
+            logger.error("Error in cleanup task: %s", e)
         await asyncio.sleep(60)
 
 
@@ -45,27 +101,9 @@ async def escalation_task():
     """Auto-escalate stale requests that have no helper after 30 minutes"""
     while True:
         try:
-            db = SessionLocal()
-            cutoff = datetime.now(timezone.utc) - timedelta(minutes=30)
-            stale = db.query(HelpRequest).filter(
-                HelpRequest.status == 'requested',
-                HelpRequest.helper_id.is_(None),
-                HelpRequest.created_at < cutoff,
-                HelpRequest.escalation_level < 2
-            ).all()
-            for req in stale:
-                req.escalation_level = min(req.escalation_level + 1, 2)
-                req.escalated_at = datetime.now(timezone.utc)
-                # Boost priority for escalated requests
-                if req.ai_priority_score:
-                    req.ai_priority_score = min(req.ai_priority_score + 15, 100)
-                logger.warning(f"Escalated request #{req.id} to level {req.escalation_level}")
-            if stale:
-                db.commit()
-                logger.info(f"Escalated {len(stale)} stale request(s)")
-            db.close()
+            await asyncio.to_thread(_run_escalation)
         except Exception as e:
-            logger.error(f"Error in escalation task: {e}")
+            logger.error("Error in escalation task: %s", e)
         await asyncio.sleep(120)
 
 
@@ -73,6 +111,10 @@ async def escalation_task():
 async def lifespan(app: FastAPI):
     """Initialize database on startup and start background tasks"""
     init_db()
+    upgrade_schema()
+    start_bcrypt_pool()
+    start_image_pool()
+    warm_up_kernels()
     
     # Create uploads directory
     uploads_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "uploads")
@@ -80,6 +122,7 @@ async def lifespan(app: FastAPI):
     
     cleanup = asyncio.create_task(cleanup_completed_requests())
     escalation = asyncio.create_task(escalation_task())
+    ai_log_writer.start()
     logger.info("ReliefLink API started — background tasks active")
     yield
     cleanup.cancel()
@@ -89,6 +132,9 @@ async def lifespan(app: FastAPI):
         await escalation
     except asyncio.CancelledError:
         pass
+    await ai_log_writer.stop()
+    shutdown_bcrypt_pool()
+    shutdown_image_pool()
 
 
 # Create FastAPI app
@@ -96,7 +142,9 @@ app = FastAPI(
     title=settings.APP_NAME,
     description="AI-Powered Multilingual Disaster Help Matching Platform",
     version=settings.APP_VERSION,
-    lifespan=lifespan
+    lifespan=lifespan,
+    # orjson for every router's JSON bodies (the requests router also builds some directly)
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -106,6 +154,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor of GET /ai/logs
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Serve uploaded images
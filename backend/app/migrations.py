@@ -0,0 +1,70 @@
+"""
+Startup schema upgrades for existing databases
+create_all only creates missing tables; columns and indexes added to the
+models since a database was created are added here, and indexes they have
+since replaced are dropped. Every step checks the live schema first, so
+this is safe to run on each start.
+"""
+from sqlalchemy import inspect, text, update, case
+
+from .database import Base, engine
+from .models import HelpRequest, URGENCY_RANKS
+from .logging_config import get_logger
+
+logger = get_logger("migrations")
+
+# (table, column) pairs added after the first release, in the order they were added
+_ADDED_COLUMNS = [
+    (HelpRequest.__table__, HelpRequest.__table__.c.urgency_rank),
+    (HelpRequest.__table__, HelpRequest.__table__.c.dedup_key),
+]
+
+
+def _backfill_urgency_rank(conn) -> None:
+    conn.execute(
+        update(HelpRequest.__table__)
+        .where(HelpRequest.urgency_rank.is_(None))
+        .values(urgency_rank=case(URGENCY_RANKS, value=HelpRequest.urgency, else_=3))
+    )
+
+
+# Run once, right after the column is added to an existing table
+_BACKFILLS = {
+    ("help_requests", "urgency_rank"): _backfill_urgency_rank,
+}
+
+
+# (table, index) pairs a model no longer declares, replaced by another index
+_DROPPED_INDEXES = [
+    ("help_requests", "ux_requests_dedup_key"),
+]
+
+
+def upgrade_schema() -> None:
+    """Bring an older database's columns and indexes in line with the models"""
+    with engine.begin() as conn:
+        inspector = inspect(conn)
+        for table, column in _ADDED_COLUMNS:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            backfill = _BACKFILLS.get((table.name, column.name))
+            if backfill:
+                backfill(conn)
+            logger.info("Added column %s.%s", table.name, column.name)
+
+        for table_name, index_name in _DROPPED_INDEXES:
+            if index_name in {i["name"] for i in inspector.get_indexes(table_name)}:
+                conn.execute(text(f"DROP INDEX {index_name}"))
+                logger.info("Dropped index %s", index_name)
+
+        # Every index the models declare (composite, partial, unique); create_all
+        # only made the ones that existed when each table was first created
+        for table in Base.metadata.sorted_tables:
+            existing = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(conn)
+                    logger.info("Created index %s", index.name)
@@ -7,8 +7,8 @@ Schema Design:
 - status_logs: Track status changes with timestamps
 - ai_logs: Track AI decisions for transparency
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, Integer, SmallInteger, String, Float, DateTime, ForeignKey, Text, Boolean, JSON, Index, and_, bindparam
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 import enum
 
@@ -19,6 +19,10 @@ def utcnow():
     return datetime.now(timezone.utc)
 
 
+# Requests in these states drop out of the open lists
+INACTIVE_STATUSES = ('completed', 'cancelled')
+
+
 class HelpType(str, enum.Enum):
     """Types of help that can be requested"""
     FOOD = "food"
@@ -36,6 +40,10 @@ class UrgencyLevel(str, enum.Enum):
     LOW = "low"
 
 
+# Sort rank for sort_by=urgency (most urgent first); anything else ranks 3
+URGENCY_RANKS = {UrgencyLevel.CRITICAL.value: 1, UrgencyLevel.MODERATE.value: 2}
+
+
 class RequestStatus(str, enum.Enum):
     """Status states for help requests"""
     REQUESTED = "requested"
@@ -58,6 +66,9 @@ class HelpRequest(Base):
     help_type = Column(String(20), nullable=False, index=True)
     description = Column(Text, nullable=True)
     urgency = Column(String(20), default="moderate", index=True)
+    # Materialized URGENCY_RANKS ordinal so urgency sorting can use an index
+    # (added to older databases by migrations.upgrade_schema)
+    urgency_rank = Column(SmallInteger, default=2)
     
     # Location (GPS coordinates + manual address)
     latitude = Column(Float, nullable=False)
@@ -131,17 +142,88 @@ class HelpRequest(Base):
     # Human review status: pending, approved, rejected
     review_status = Column(String(20), nullable=True)
     
+    # === RESUBMISSION ===
+    # sha256 of the submission (routers.requests._dedup_key); unique among
+    # open requests, so a retried submission can only ever be stored once
+    dedup_key = Column(String(64), nullable=True)
+    
     # Relationships
     helper = relationship("Helper", back_populates="accepted_requests")
     status_logs = relationship("StatusLog", back_populates="request")
     
+    @validates('urgency')
+    def _set_urgency_rank(self, key, urgency):
+        """Keep urgency_rank in step with every urgency assignment"""
+        self.urgency_rank = URGENCY_RANKS.get(urgency, 3)
+        return urgency
+    
     # Composite indexes for common queries
     __table_args__ = (
         Index('ix_requests_status_priority', 'status', 'ai_priority_score'),
         Index('ix_requests_location', 'latitude', 'longitude'),
+        Index('ix_requests_status_location', 'status', 'latitude', 'longitude'),
+        # List endpoints with ?status=<one status> in priority order. The
+        # partial ix_requests_active_priority_created below can't serve these
+        # (completed/cancelled aren't in it, and it has no status column)
+        Index('ix_requests_status_priority_created', 'status', priority_score.desc(), 'created_at'),
+        # ?sort_by=urgency with ?status=all or one status; the partial
+        # ix_requests_active_urgency_created below only holds open requests
+        Index('ix_requests_urgency_rank_created', 'urgency_rank', 'created_at'),
+        # Background tasks: cleanup of completed rows, escalation of stale unassigned ones
+        Index('ix_help_requests_status_completed_at', 'status', 'completed_at'),
+        Index('ix_help_requests_status_helper_created', 'status', 'helper_id', 'created_at'),
+        # 24h windows (duplicate/spam checks), helper dashboards, per-phone spam counts
+        Index('ix_requests_status_created', 'status', 'created_at'),
+        Index('ix_requests_helper_status', 'helper_id', 'status'),
+        Index('ix_requests_phone_created', 'phone', 'created_at'),
+        # Open, unassigned requests by priority (recommendations); partial where supported
+        Index(
+            'ix_requests_open_priority', ai_priority_score.desc(),
+            postgresql_where=and_(status == 'requested', helper_id.is_(None)),
+            sqlite_where=and_(status == 'requested', helper_id.is_(None)),
+        ),
+        # Default list view (no ?status, everything still open) in its default
+        # order; a NOT IN on the leading status column above can't give rows
+        # in order. Queries must use active_request_filter() to match the predicate
+        Index(
+            'ix_requests_active_priority_created', priority_score.desc(), 'created_at',
+            postgresql_where=status.notin_(INACTIVE_STATUSES),
+            sqlite_where=status.notin_(INACTIVE_STATUSES),
+        ),
+        # Default list view sorted by urgency; without it every open row is
+        # sorted per page. urgency_rank is maintained on write;
+        # older databases get the column, its backfill and these indexes
+        # from migrations.upgrade_schema()
+        Index(
+            'ix_requests_active_urgency_created', 'urgency_rank', 'created_at',
+            postgresql_where=status.notin_(INACTIVE_STATUSES),
+            sqlite_where=status.notin_(INACTIVE_STATUSES),
+        ),
+        # Completed/cancelled requests keep their key but no longer block a new submission
+        Index(
+            'ux_requests_active_dedup_key', 'dedup_key', unique=True,
+            postgresql_where=status.notin_(INACTIVE_STATUSES),
+            sqlite_where=status.notin_(INACTIVE_STATUSES),
+        ),
+        # Admin review queue, newest first
+        Index(
+            'ix_requests_flagged_created', created_at.desc(),
+            postgresql_where=is_flagged == True,
+            sqlite_where=is_flagged == True,
+        ),
     )
 
 
+def active_request_filter():
+    """
+    status NOT IN INACTIVE_STATUSES, with the values rendered inline so the
+    planner can match it to the ix_requests_active_priority_created predicate
+    """
+    return HelpRequest.status.notin_(bindparam(
+        'inactive_statuses', list(INACTIVE_STATUSES), expanding=True, literal_execute=True
+    ))
+
+
 class Helper(Base):
     """
     Helper/Volunteer table
@@ -170,7 +252,7 @@ class Helper(Base):
     
     # Stats
     requests_completed = Column(Integer, default=0)
-    is_active = Column(Integer, default=1)  # 1 = active, 0 = inactive
+    is_active = Column(Integer, default=1, index=True)  # 1 = active, 0 = inactive
     rating = Column(Float, default=5.0)  # Average rating from requesters
     
     # Timestamps
@@ -229,3 +311,8 @@ class AILog(Base):
     processing_time_ms = Column(Integer, nullable=True)
     
     created_at = Column(DateTime, default=utcnow)
+
+    # Paginated per-request log listing (newest first)
+    __table_args__ = (
+        Index('ix_ai_logs_request_id_id', 'request_id', 'id'),
+    )
@@ -11,20 +11,27 @@ Endpoints:
 - POST /api/ai/check-duplicate - Check for duplicates
 - GET /api/ai/helper-matches/{request_id} - Get helper recommendations
 """
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
-from pydantic import BaseModel
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, TypeAdapter
+from typing import List, NamedTuple, Optional, Dict, Any
 from datetime import datetime, timedelta
+import threading
+from cachetools import TTLCache
+import numpy as np
 
-from ..database import get_db
+from ..database import get_readonly_db
 from ..models import HelpRequest, Helper, AILog
+from ..utils import haversine_batch, bounding_box
+from ..services._kernels import score_recommendations
+from ..ai_log_writer import ai_log_writer
 from ..services.ai_service import (
     calculate_ai_priority,
     auto_categorize_request,
     translate_and_simplify,
     check_for_duplicates,
+    to_duplicate_columns,
     check_for_spam,
     get_helper_recommendations,
     process_request_with_ai,
@@ -33,7 +40,6 @@ from ..services.ai_service import (
 
 router = APIRouter(prefix="/ai", tags=["AI Features"])
 
-
 # ============================================================
 # PYDANTIC MODELS FOR API
 # ============================================================
@@ -60,6 +66,8 @@ class AIPriorityRequest(BaseModel):
 
 class AIPriorityResponse(BaseModel):
     """Response for priority calculation"""
+    model_config = ConfigDict(extra="ignore")
+
     score: int
     label: str
     reasons: List[str]
@@ -75,6 +83,8 @@ class AICategoryRequest(BaseModel):
 
 class AICategoryResponse(BaseModel):
     """Response for auto-categorization"""
+    model_config = ConfigDict(extra="ignore")
+
     detected_type: str
     confidence: float
     extracted_supplies: List[str]
@@ -89,6 +99,8 @@ class AITranslateRequest(BaseModel):
 
 class AITranslateResponse(BaseModel):
     """Response for translation"""
+    model_config = ConfigDict(extra="ignore")
+
     detected_language: str
     original_text: str
     translated_text: str
@@ -107,6 +119,8 @@ class AIDuplicateRequest(BaseModel):
 
 class AIDuplicateResponse(BaseModel):
     """Response for duplicate check"""
+    model_config = ConfigDict(extra="ignore")
+
     is_duplicate: bool
     duplicate_of_id: Optional[int]
     similarity_score: float
@@ -115,6 +129,8 @@ class AIDuplicateResponse(BaseModel):
 
 class AIHelperMatchResponse(BaseModel):
     """Response for helper matching"""
+    model_config = ConfigDict(extra="ignore", from_attributes=True)
+
     helper_id: int
     helper_name: str
     distance_km: float
@@ -124,6 +140,8 @@ class AIHelperMatchResponse(BaseModel):
 
 class AIFullAnalysisResponse(BaseModel):
     """Response for full AI analysis"""
+    model_config = ConfigDict(extra="ignore")
+
     success: bool
     processing_time_ms: float
     priority: Optional[Dict[str, Any]]
@@ -134,14 +152,69 @@ class AIFullAnalysisResponse(BaseModel):
     errors: List[str]
 
 
+# Built once; validates AIHelperMatch dataclasses straight into response models
+_helper_match_adapter = TypeAdapter(List[AIHelperMatchResponse])
+
+
+# ============================================================
+# RECENT REQUESTS SNAPSHOT
+# ============================================================
+
+# Last-24h rows shared by /analyze and /check-duplicate, so bursts of calls
+# during an incident hit the database once per TTL. Writers that add or
+# close requests call invalidate_recent_requests().
+_recent_cache: TTLCache = TTLCache(maxsize=1, ttl=10)
+_recent_cache_lock = threading.Lock()
+
+# Duplicate detection radius
+DUPLICATE_RADIUS_KM = 0.5
+
+
+class _RecentSnapshot(NamedTuple):
+    recent: List[Any]                              # all statuses (spam counters)
+    active: Dict[str, Any]                         # open requests, column layout
+
+
+def _recent_requests(db: Session) -> _RecentSnapshot:
+    """Requests from the last 24h; open ones in check_for_duplicates' column layout"""
+    with _recent_cache_lock:
+        snapshot = _recent_cache.get('recent')
+    if snapshot is None:
+        rows = db.query(HelpRequest).with_entities(
+            HelpRequest.id,
+            HelpRequest.description,
+            HelpRequest.latitude,
+            HelpRequest.longitude,
+            HelpRequest.phone,
+            HelpRequest.help_type,
+            HelpRequest.status,
+        ).filter(
+            HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
+        ).all()
+        active_rows = [r for r in rows if r.status not in ('completed', 'cancelled')]
+        
+        # check_for_duplicates prunes far rows itself and still scores them
+        # when nothing near is similar, so it gets every open row
+        snapshot = _RecentSnapshot(rows, to_duplicate_columns(active_rows))
+        with _recent_cache_lock:
+            _recent_cache['recent'] = snapshot
+    return snapshot
+
+
+def invalidate_recent_requests() -> None:
+    """Drop the cached snapshot (after a request is created or changes status)"""
+    with _recent_cache_lock:
+        _recent_cache.clear()
+
+
 # ============================================================
 # API ENDPOINTS
 # ============================================================
 
 @router.post("/analyze", response_model=AIFullAnalysisResponse)
-async def analyze_request(
+def analyze_request(
     request: AIAnalyzeRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Run full AI analysis on a help request.
@@ -155,37 +228,23 @@ async def analyze_request(
     
     Use this before creating a new request to get AI insights.
     """
-    # Get existing requests for duplicate detection
-    existing_requests = db.query(HelpRequest).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled']),
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).all()
-    
-    existing_data = [{
-        'id': r.id,
-        'description': r.description,
-        'latitude': r.latitude,
-        'longitude': r.longitude,
-        'phone': r.phone,
-        'help_type': r.help_type,
-        'status': r.status
-    } for r in existing_requests]
+    # One snapshot of the last 24h serves duplicate detection and both spam counters
+    snapshot = _recent_requests(db)
+    recent = snapshot.recent
+    existing_data = snapshot.active
     
     # Count recent requests from same phone
     recent_from_phone = 0
     if request.phone:
-        recent_from_phone = db.query(HelpRequest).filter(
-            HelpRequest.phone == request.phone,
-            HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-        ).count()
+        recent_from_phone = sum(1 for r in recent if r.phone == request.phone)
     
     # Count recent requests from nearby location
     # Simple approximation: within ~1km (0.01 degrees)
-    recent_from_location = db.query(HelpRequest).filter(
-        func.abs(HelpRequest.latitude - request.latitude) < 0.01,
-        func.abs(HelpRequest.longitude - request.longitude) < 0.01,
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).count()
+    recent_from_location = sum(
+        1 for r in recent
+        if abs(r.latitude - request.latitude) < 0.01
+        and abs(r.longitude - request.longitude) < 0.01
+    )
     
     # Run AI analysis
     result = process_request_with_ai(
@@ -285,9 +344,9 @@ async def translate_text(request: AITranslateRequest):
 
 
 @router.post("/check-duplicate", response_model=AIDuplicateResponse)
-async def check_duplicate(
+def check_duplicate(
     request: AIDuplicateRequest,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Check if a request appears to be a duplicate.
@@ -298,21 +357,8 @@ async def check_duplicate(
     - Same phone number
     - Time window (24 hours)
     """
-    # Get recent requests for comparison
-    existing_requests = db.query(HelpRequest).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled']),
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).all()
-    
-    existing_data = [{
-        'id': r.id,
-        'description': r.description,
-        'latitude': r.latitude,
-        'longitude': r.longitude,
-        'phone': r.phone,
-        'help_type': r.help_type,
-        'status': r.status
-    } for r in existing_requests]
+    # Get recent requests that could match
+    existing_data = _recent_requests(db).active
     
     result = check_for_duplicates(
         new_request={
@@ -322,7 +368,8 @@ async def check_duplicate(
             'phone': request.phone,
             'help_type': request.help_type
         },
-        existing_requests=existing_data
+        existing_requests=existing_data,
+        location_radius_km=DUPLICATE_RADIUS_KM
     )
     
     return AIDuplicateResponse(
@@ -334,10 +381,10 @@ async def check_duplicate(
 
 
 @router.get("/helper-matches/{request_id}", response_model=List[AIHelperMatchResponse])
-async def get_helper_matches(
+def get_helper_matches(
     request_id: int,
     top_n: int = Query(default=3, ge=1, le=10),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get recommended helpers for a specific request.
@@ -387,20 +434,14 @@ async def get_helper_matches(
         top_n=top_n
     )
     
-    return [AIHelperMatchResponse(
-        helper_id=m.helper_id,
-        helper_name=m.helper_name,
-        distance_km=m.distance_km,
-        match_score=m.match_score,
-        match_reasons=m.match_reasons
-    ) for m in matches]
+    return _helper_match_adapter.validate_python(matches, from_attributes=True)
 
 
 @router.get("/smart-recommendations/{helper_id}")
-async def get_smart_recommendations_for_helper(
+def get_smart_recommendations_for_helper(
     helper_id: int,
     top_n: int = Query(default=5, ge=1, le=20),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get recommended requests for a specific helper.
@@ -419,77 +460,98 @@ async def get_smart_recommendations_for_helper(
     if not helper.latitude or not helper.longitude:
         raise HTTPException(status_code=400, detail="Helper location not available")
     
-    # Get active requests
-    requests = db.query(HelpRequest).filter(
+    max_dist = helper.max_distance_km or 10
+    min_lat, max_lat, min_lon, max_lon = bounding_box(helper.latitude, helper.longitude, max_dist)
+    
+    # Every open request in the bounding box, so total_requests is exact and
+    # the top N never miss a lower-priority request that is close by
+    # (plain tuples - only the columns we score or return). Priority order
+    # only breaks match-score ties, as it always has
+    rows = db.query(HelpRequest).with_entities(
+        HelpRequest.id,
+        HelpRequest.latitude,
+        HelpRequest.longitude,
+        HelpRequest.help_type,
+        HelpRequest.urgency,
+        HelpRequest.ai_priority_score,
+        HelpRequest.priority_score,
+        HelpRequest.ai_priority_label,
+        # One char past the preview length tells us whether to add '...'
+        func.substr(HelpRequest.description, 1, 101).label('description_head'),
+        HelpRequest.address,
+        HelpRequest.contact_name,
+        HelpRequest.created_at,
+    ).filter(
         HelpRequest.status.in_(['requested']),
-        HelpRequest.helper_id.is_(None)
+        HelpRequest.helper_id.is_(None),
+        HelpRequest.latitude.between(min_lat, max_lat),
+        HelpRequest.longitude.between(min_lon, max_lon)
     ).order_by(HelpRequest.ai_priority_score.desc()).all()
     
-    recommendations = []
+    can_help = (helper.can_help_with or '').lower()
     
-    from ..services.ai_service import haversine_distance
+    # Score every request in one vectorized pass
+    n = len(rows)
+    lat = np.fromiter((r.latitude for r in rows), dtype=np.float64, count=n)
+    lon = np.fromiter((r.longitude for r in rows), dtype=np.float64, count=n)
+    priority = np.fromiter((r.ai_priority_score or 50 for r in rows), dtype=np.float64, count=n)
+    skill_mask = np.fromiter((r.help_type in can_help for r in rows), dtype=bool, count=n)
+    critical_mask = np.fromiter((r.urgency == 'critical' for r in rows), dtype=bool, count=n)
     
-    for req in requests:
-        # Calculate distance
-        distance = haversine_distance(
-            helper.latitude, helper.longitude,
-            req.latitude, req.longitude
-        )
-        
-        # Skip if too far
-        max_dist = helper.max_distance_km or 10
-        if distance > max_dist:
-            continue
-        
-        # Calculate match score
-        score = 0
-        reasons = []
-        
-        # Priority boost
-        priority_boost = (req.ai_priority_score or 50) * 0.4
-        score += priority_boost
-        reasons.append(f"🔥 Priority: {req.ai_priority_score or 50}")
-        
-        # Distance score (closer = better)
-        distance_score = (1 - distance / max_dist) * 30
-        score += distance_score
-        reasons.append(f"📍 {distance:.1f}km away")
+    distance = haversine_batch(helper.latitude, helper.longitude, lat, lon)
+    
+    # Skip if too far
+    in_range = np.flatnonzero(distance <= max_dist)
+    distance = distance[in_range]
+    
+    score = np.empty(len(in_range))
+    score_recommendations(
+        priority[in_range], distance, float(max_dist),
+        skill_mask[in_range], critical_mask[in_range], score
+    )
+    match_score = np.round(np.minimum(100, score), 1)
+    
+    # Top-N by match score; ties keep the priority ordering of the query
+    order = np.arange(len(in_range))
+    if len(order) > top_n:
+        order = np.argpartition(-match_score, top_n - 1)[:top_n]
+    order = order[np.lexsort((order, -match_score[order]))]
+    
+    recommendations = []
+    for i in order:
+        req = rows[in_range[i]]
+        dist = float(distance[i])
         
-        # Skill match
-        can_help = (helper.can_help_with or '').lower()
-        if req.help_type in can_help:
-            score += 20
+        reasons = [
+            f"🔥 Priority: {req.ai_priority_score or 50}",
+            f"📍 {dist:.1f}km away",
+        ]
+        if skill_mask[in_range[i]]:
             reasons.append(f"✓ Matches your skills")
-        
-        # Critical urgency boost
-        if req.urgency == 'critical':
-            score += 10
+        if critical_mask[in_range[i]]:
             reasons.append("🚨 Critical urgency")
         
         recommendations.append({
             'request_id': req.id,
             'help_type': req.help_type,
             'urgency': req.urgency,
-            'description': req.description[:100] + '...' if req.description and len(req.description) > 100 else req.description,
-            'distance_km': round(distance, 2),
+            'description': req.description_head[:100] + '...' if req.description_head and len(req.description_head) > 100 else req.description_head,
+            'distance_km': round(dist, 2),
             'priority_score': req.ai_priority_score or req.priority_score,
             'priority_label': req.ai_priority_label or 'medium',
-            'match_score': round(min(100, score), 1),
+            'match_score': float(match_score[i]),
             'match_reasons': reasons,
             'address': req.address,
             'contact_name': req.contact_name,
             'created_at': req.created_at.isoformat() if req.created_at else None
         })
     
-    # Sort by match score
-    recommendations.sort(key=lambda x: x['match_score'], reverse=True)
-    
     return {
         'helper_id': helper_id,
         'helper_name': helper.name,
         'location': {'lat': helper.latitude, 'lon': helper.longitude},
-        'total_requests': len(recommendations),
-        'recommendations': recommendations[:top_n]
+        'total_requests': int(len(in_range)),
+        'recommendations': recommendations
     }
 
 
@@ -501,15 +563,16 @@ async def log_ai_decision(
     explanation: str,
     confidence: float = None,
     was_overridden: bool = False,
-    override_reason: str = None,
-    db: Session = Depends(get_db)
+    override_reason: str = None
 ):
     """
     Log an AI decision for transparency and audit.
     
     Call this after any AI decision to maintain a clear audit trail.
+    The entry is queued and written in the background, batched with other
+    logs, so no log_id is returned; read entries back via GET /logs/{request_id}.
     """
-    log = AILog(
+    ai_log_writer.enqueue(
         request_id=request_id,
         action_type=action_type,
         output_data=output_data,
@@ -519,25 +582,42 @@ async def log_ai_decision(
         override_reason=override_reason
     )
     
-    db.add(log)
-    db.commit()
-    
-    return {"status": "logged", "log_id": log.id}
+    return {"status": "queued"}
 
 
 @router.get("/logs/{request_id}")
-async def get_ai_logs(
+def get_ai_logs(
     request_id: int,
-    db: Session = Depends(get_db)
+    response: Response,
+    cursor: Optional[int] = Query(default=None, description="X-Next-Cursor from the previous page"),
+    limit: Optional[int] = Query(default=None, ge=1, le=200, description="Page size; omit for all logs"),
+    db: Session = Depends(get_readonly_db)
 ):
     """
-    Get all AI decision logs for a specific request.
+    Get AI decision logs for a specific request, newest first.
     
     Useful for understanding why certain decisions were made.
+    Optionally paginated by keyset: with `limit`, a full page sets the
+    X-Next-Cursor header; pass it back as `cursor` for the next page.
     """
-    logs = db.query(AILog).filter(
-        AILog.request_id == request_id
-    ).order_by(AILog.created_at.desc()).all()
+    query = db.query(AILog).with_entities(
+        AILog.id,
+        AILog.action_type,
+        AILog.output_data,
+        AILog.confidence,
+        AILog.explanation,
+        AILog.was_overridden,
+        AILog.override_reason,
+        AILog.created_at,
+    ).filter(AILog.request_id == request_id)
+    if cursor is not None:
+        query = query.filter(AILog.id < cursor)
+    # Log ids increase with insertion time, so id order is created_at order
+    # without ties at page boundaries
+    logs = query.order_by(AILog.id.desc()).limit(limit).all()
+    
+    if limit is not None and len(logs) == limit:
+        response.headers['X-Next-Cursor'] = str(logs[-1].id)
     
     return [{
         'id': log.id,
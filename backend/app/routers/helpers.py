@@ -4,16 +4,20 @@ Handles volunteer/NGO registration and dashboard with JWT auth
 """
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import desc, func, case
 from typing import Optional
 from datetime import datetime, timezone
+import asyncio
+import heapq
 
-from ..database import get_db
+from ..database import get_db, get_readonly_db
 from ..models import Helper, HelpRequest
 from ..schemas import HelperCreate, HelperResponse, HelperDashboard, HelpRequestResponse
-from ..utils import mask_phone, format_time_ago, haversine_distance
+from ..utils import mask_phone, format_time_ago
+from ..geo_index import nearby_open_requests
+from .stats import invalidate_stats
 from ..auth import (
-    get_password_hash, verify_password, create_access_token,
+    aget_password_hash, averify_password, create_access_token,
     TokenResponse, get_current_user, require_auth, TokenData
 )
 from ..logging_config import get_logger
@@ -36,9 +40,10 @@ def helper_to_response(helper: Helper) -> HelperResponse:
     )
 
 
-def request_to_response(request: HelpRequest) -> HelpRequestResponse:
+def request_to_response(request: HelpRequest, now: Optional[datetime] = None) -> HelpRequestResponse:
     """Convert request model to response"""
-    return HelpRequestResponse(
+    # Values come straight from typed columns, so skip re-validation
+    return HelpRequestResponse.model_construct(
         id=request.id,
         help_type=request.help_type,
         description=request.description,
@@ -56,10 +61,17 @@ def request_to_response(request: HelpRequest) -> HelpRequestResponse:
         updated_at=request.updated_at,
         accepted_at=request.accepted_at,
         completed_at=request.completed_at,
-        time_ago=format_time_ago(request.created_at)
+        time_ago=format_time_ago(request.created_at, now)
     )
 
 
+def _helper_by_phone(db: Session, phone: str) -> Optional[Helper]:
+    return db.query(Helper).filter(Helper.phone == phone).first()
+
+
+# register and login await bcrypt on its own pool, so they stay async; their
+# Session work (sync) goes through asyncio.to_thread to keep it off the event loop
+
 @router.post("/", response_model=HelperResponse, status_code=201)
 async def register_helper(
     helper_data: HelperCreate,
@@ -70,26 +82,38 @@ async def register_helper(
     Returns helper profile + JWT token
     """
     # Check if phone already registered
-    existing = db.query(Helper).filter(Helper.phone == helper_data.phone).first()
+    existing = await asyncio.to_thread(_helper_by_phone, db, helper_data.phone)
     if existing:
         raise HTTPException(status_code=400, detail="Phone number already registered")
     
+    password_hash = None
+    if helper_data.password:
+        password_hash = await aget_password_hash(helper_data.password)
+    
+    # Naive UTC timestamps, as every other endpoint reads them back from the
+    # table (the column default is tz-aware, and the response is built before commit)
+    now = datetime.utcnow()
     db_helper = Helper(
         name=helper_data.name,
         phone=helper_data.phone,
-        password_hash=get_password_hash(helper_data.password) if helper_data.password else None,
+        password_hash=password_hash,
         organization=helper_data.organization,
         latitude=helper_data.latitude,
         longitude=helper_data.longitude,
-        can_help_with=helper_data.can_help_with
+        can_help_with=helper_data.can_help_with,
+        created_at=now,
+        last_active=now
     )
     
     db.add(db_helper)
-    db.commit()
-    db.refresh(db_helper)
-    logger.info(f"New helper registered: {db_helper.name} (ID: {db_helper.id})")
+    # Flush assigns id and column defaults; read them before commit expires the object
+    await asyncio.to_thread(db.flush)
+    response = helper_to_response(db_helper)
+    await asyncio.to_thread(db.commit)
+    invalidate_stats()
+    logger.info(f"New helper registered: {response.name} (ID: {response.id})")
     
-    return helper_to_response(db_helper)
+    return response
 
 
 @router.post("/login")
@@ -102,20 +126,18 @@ async def login_helper(
     Login for helpers using phone number + optional password
     Returns JWT token for authenticated access
     """
-    helper = db.query(Helper).filter(Helper.phone == phone).first()
+    helper = await asyncio.to_thread(_helper_by_phone, db, phone)
     
     if not helper:
         raise HTTPException(status_code=404, detail="Helper not found. Please register first.")
     
     # Verify password if helper has one set
     if helper.password_hash and password:
-        if not verify_password(password, helper.password_hash):
+        if not await averify_password(password, helper.password_hash):
             raise HTTPException(status_code=401, detail="Invalid password")
     
     # Update last active time
     helper.last_active = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(helper)
     
     # Create JWT token
     token = create_access_token({
@@ -124,9 +146,8 @@ async def login_helper(
         "role": helper.role or "helper"
     })
     
-    logger.info(f"Helper logged in: {helper.name} (ID: {helper.id})")
-    
-    return {
+    # Everything below is already loaded; build it before commit expires the object
+    response = {
         "success": True,
         "access_token": token,
         "token_type": "bearer",
@@ -141,24 +162,40 @@ async def login_helper(
             "role": helper.role or "helper"
         }
     }
+    await asyncio.to_thread(db.commit)
+    
+    logger.info(f"Helper logged in: {response['helper']['name']} (ID: {response['helper']['id']})")
+    
+    return response
 
 
 @router.get("/", response_model=list[HelperResponse])
-async def get_helpers(
+def get_helpers(
     active_only: bool = True,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """Get list of registered helpers"""
-    query = db.query(Helper)
+    # Plain rows of just the response columns; no ORM instances needed
+    query = db.query(Helper).with_entities(
+        Helper.id,
+        Helper.name,
+        Helper.organization,
+        Helper.can_help_with,
+        Helper.requests_completed,
+        Helper.is_active,
+        Helper.created_at,
+        Helper.last_active,
+    )
     if active_only:
         query = query.filter(Helper.is_active == 1)
     
-    helpers = query.order_by(desc(Helper.requests_completed)).all()
-    return [helper_to_response(h) for h in helpers]
+    rows = query.order_by(desc(Helper.requests_completed)).all()
+    # Values come straight from typed columns, so skip re-validation
+    return [HelperResponse.model_construct(**r._mapping) for r in rows]
 
 
 @router.get("/{helper_id}", response_model=HelperResponse)
-async def get_helper(helper_id: int, db: Session = Depends(get_db)):
+def get_helper(helper_id: int, db: Session = Depends(get_readonly_db)):
     """Get helper by ID"""
     helper = db.query(Helper).filter(Helper.id == helper_id).first()
     if not helper:
@@ -167,11 +204,11 @@ async def get_helper(helper_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/{helper_id}/dashboard", response_model=HelperDashboard)
-async def get_helper_dashboard(
+def get_helper_dashboard(
     helper_id: int,
     lat: Optional[float] = None,
     lon: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get helper dashboard with active requests and nearby requests
@@ -181,17 +218,20 @@ async def get_helper_dashboard(
     if not helper:
         raise HTTPException(status_code=404, detail="Helper not found")
     
-    # Get helper's active requests
-    active_requests = db.query(HelpRequest).filter(
-        HelpRequest.helper_id == helper_id,
-        HelpRequest.status.in_(['accepted', 'in_progress'])
-    ).all()
+    # Count active and completed assignments in one round-trip
+    active_count, completed_count = db.query(
+        func.sum(case((HelpRequest.status.in_(['accepted', 'in_progress']), 1), else_=0)),
+        func.sum(case((HelpRequest.status == 'completed', 1), else_=0))
+    ).filter(HelpRequest.helper_id == helper_id).one()
+    completed_count = completed_count or 0
     
-    # Get completed count
-    completed_count = db.query(HelpRequest).filter(
-        HelpRequest.helper_id == helper_id,
-        HelpRequest.status == 'completed'
-    ).count()
+    # Get helper's active requests (only if there are any)
+    active_requests = []
+    if active_count:
+        active_requests = db.query(HelpRequest).filter(
+            HelpRequest.helper_id == helper_id,
+            HelpRequest.status.in_(['accepted', 'in_progress'])
+        ).all()
     
     # Get nearby available requests
     nearby_requests = []
@@ -199,36 +239,37 @@ async def get_helper_dashboard(
     use_lon = lon or helper.longitude
     
     if use_lat and use_lon:
-        # Get all available requests
-        available = db.query(HelpRequest).filter(
-            HelpRequest.status == 'requested'
-        ).all()
+        # Candidates within 50km from the in-memory grid; keep the top 10
+        # by priority then distance before touching the table
+        top = heapq.nsmallest(
+            10, nearby_open_requests(db, use_lat, use_lon, 50),
+            key=lambda x: (-x[2], x[1])
+        )
+        top_ids = [request_id for request_id, _, _ in top]
         
-        # Calculate distance and filter
-        for req in available:
-            distance = haversine_distance(use_lat, use_lon, req.latitude, req.longitude)
-            if distance <= 50:  # Within 50km
-                nearby_requests.append((req, distance))
-        
-        # Sort by priority then distance
-        nearby_requests.sort(key=lambda x: (-x[0].priority_score, x[1]))
-        nearby_requests = [r[0] for r in nearby_requests[:10]]  # Top 10
+        # Re-check status in case the grid is a little stale
+        rows = {r.id: r for r in db.query(HelpRequest).filter(
+            HelpRequest.id.in_(top_ids),
+            HelpRequest.status == 'requested'
+        ).all()} if top_ids else {}
+        nearby_requests = [rows[i] for i in top_ids if i in rows]
     else:
         # No location - just get highest priority
         nearby_requests = db.query(HelpRequest).filter(
             HelpRequest.status == 'requested'
         ).order_by(desc(HelpRequest.priority_score)).limit(10).all()
     
+    now = datetime.utcnow()
     return HelperDashboard(
         helper=helper_to_response(helper),
-        active_requests=[request_to_response(r) for r in active_requests],
+        active_requests=[request_to_response(r, now) for r in active_requests],
         completed_count=completed_count,
-        nearby_requests=[request_to_response(r) for r in nearby_requests]
+        nearby_requests=[request_to_response(r, now) for r in nearby_requests]
     )
 
 
 @router.patch("/{helper_id}/location")
-async def update_helper_location(
+def update_helper_location(
     helper_id: int,
     lat: float = Query(..., ge=-90, le=90),
     lon: float = Query(..., ge=-180, le=180),
@@ -249,7 +290,7 @@ async def update_helper_location(
 
 
 @router.patch("/{helper_id}/status")
-async def update_helper_status(
+def update_helper_status(
     helper_id: int,
     is_active: bool,
     db: Session = Depends(get_db)
@@ -263,5 +304,6 @@ async def update_helper_status(
     helper.last_active = datetime.utcnow()
     
     db.commit()
+    invalidate_stats()
     
     return {"message": f"Helper {'activated' if is_active else 'deactivated'}"}
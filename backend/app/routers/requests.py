@@ -4,99 +4,305 @@ Handles all CRUD operations for disaster help requests
 """
 import os
 import uuid
-from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
+import hashlib
+import asyncio
+import threading
+from contextlib import aclosing
+from anyio import from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, Request, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
+from sqlalchemy.orm import Session, joinedload, load_only
+from sqlalchemy import func, desc, select, update, lambda_stmt
+from sqlalchemy.exc import IntegrityError
 from typing import Optional, List
 from datetime import datetime, timedelta, timezone
-from PIL import Image
-import io
+import numpy as np
+import orjson
+from cachetools import TTLCache
 
-from ..database import get_db
-from ..models import HelpRequest, Helper, StatusLog, AILog
+from ..database import get_db, get_readonly_db, ReadOnlySessionLocal
+from ..models import HelpRequest, Helper, StatusLog, AILog, active_request_filter
 from ..schemas import (
     HelpRequestCreate, HelpRequestUpdate, HelpRequestResponse,
-    HelpRequestList, StatusLogResponse
+    StatusLogResponse
 )
-from ..utils import mask_phone, format_time_ago, calculate_priority_score, haversine_distance
-from ..services.ai_service import process_request_with_ai
-from ..events import event_bus
+from ..utils import (
+    mask_phone, format_time_ago, format_times_ago, calculate_priority_score,
+    haversine_distance, haversine_batch, bounding_box,
+)
+from ..services.ai_service import process_request_with_ai, to_duplicate_columns
+from ..geo_index import invalidate_open_requests
+from ..images import aresize_and_save
+from .ai import invalidate_recent_requests
+from .stats import invalidate_stats
+from ..events import EventBus, event_bus
 from ..logging_config import get_logger
 
 logger = get_logger("requests")
-router = APIRouter(prefix="/requests", tags=["Help Requests"])
+router = APIRouter(prefix="/requests", tags=["Help Requests"], default_response_class=ORJSONResponse)
+
+# Rows fetched per round trip by GET /stream
+STREAM_BATCH_SIZE = 50
+
+# A repeat of the same submission inside this window is treated as a retry
+RESUBMIT_WINDOW = timedelta(minutes=10)
+
+# Serialized first pages of GET / (no coordinates), keyed by filters + page size.
+# Every write in this router calls invalidate_request_lists(); the short TTL
+# bounds staleness from other processes, background escalation and time_ago
+_list_cache: TTLCache = TTLCache(maxsize=64, ttl=5)
+_list_cache_lock = threading.Lock()
+
+
+def invalidate_request_lists():
+    """Drop cached list pages (call after any write that changes a listed request)"""
+    with _list_cache_lock:
+        _list_cache.clear()
 
 UPLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "uploads")
 
 
+# Hot by-id lookups as lambda_stmt: the statement is built and cached once per
+# call site, so each call only binds the new id
+
+def _get_request(db: Session, request_id: int) -> Optional[HelpRequest]:
+    return db.execute(lambda_stmt(
+        lambda: select(HelpRequest).where(HelpRequest.id == request_id)
+    )).scalar_one_or_none()
+
+
+def _get_request_with_helper(db: Session, request_id: int) -> Optional[HelpRequest]:
+    """_get_request with the assigned helper joined in, for read-only responses"""
+    return db.execute(lambda_stmt(
+        lambda: select(HelpRequest).options(joinedload(HelpRequest.helper))
+        .where(HelpRequest.id == request_id)
+    )).scalar_one_or_none()
+
+
+def _get_helper(db: Session, helper_id: int) -> Optional[Helper]:
+    return db.execute(lambda_stmt(
+        lambda: select(Helper).where(Helper.id == helper_id)
+    )).scalar_one_or_none()
+
+
+def _get_status_logs(db: Session, request_id: int) -> List[StatusLog]:
+    return db.execute(lambda_stmt(
+        lambda: select(StatusLog).where(StatusLog.request_id == request_id).order_by(StatusLog.created_at)
+    )).scalars().all()
+
+
+# Optional response fields, copied in groups: each group is only filled in when
+# its guard column is set (not None, or truthy where 0/False/empty means "none")
+# (guard column, truthy check, fields)
+_OPTIONAL_FIELD_GROUPS = (
+    ('ai_priority_score', False, ('ai_priority_score', 'ai_priority_label', 'ai_priority_reason')),
+    ('ai_detected_type', True, ('ai_detected_type', 'ai_confidence', 'extracted_supplies')),
+    ('detected_language', True, ('detected_language', 'translated_text', 'simplified_text')),
+    ('is_flagged', True, ('is_flagged', 'flag_reason')),
+    ('duplicate_of_id', True, ('duplicate_of_id', 'duplicate_similarity')),
+    ('image_urls', True, ('image_urls',)),
+    ('distress_score', False, ('distress_score', 'distress_indicators')),
+    ('escalation_level', True, ('escalation_level', 'escalated_at')),
+)
+_OPTIONAL_FIELDS = tuple(name for _, _, fields in _OPTIONAL_FIELD_GROUPS for name in fields)
+
+# Columns _base_fields reads (phone feeds phone_masked)
+_BASE_COLUMNS = (
+    'id', 'help_type', 'description', 'urgency', 'latitude', 'longitude', 'address',
+    'phone', 'contact_name', 'status', 'helper_id', 'priority_score',
+    'created_at', 'updated_at', 'accepted_at', 'completed_at',
+)
+
+# Loader options for read-only list queries: just the columns a response
+# uses, and only the name of the assigned helper
+_RESPONSE_LOAD = (
+    load_only(*(getattr(HelpRequest, name) for name in _BASE_COLUMNS + _OPTIONAL_FIELDS)),
+    joinedload(HelpRequest.helper).load_only(Helper.name),
+)
+
+
+def _optional_fields(request: HelpRequest, out: dict) -> dict:
+    """Fill `out` with the optional field groups whose guard column is set"""
+    for guard, truthy, fields in _OPTIONAL_FIELD_GROUPS:
+        value = getattr(request, guard)
+        if (value if truthy else value is not None):
+            for name in fields:
+                out[name] = getattr(request, name)
+    return out
+
+
+def _base_fields(request: HelpRequest, include_phone: bool, time_ago: str) -> dict:
+    """Always-present response fields"""
+    return {
+        'id': request.id,
+        'help_type': request.help_type,
+        'description': request.description,
+        'urgency': request.urgency,
+        'latitude': request.latitude,
+        'longitude': request.longitude,
+        'address': request.address,
+        'phone_masked': mask_phone(request.phone) if request.phone else None,
+        'phone': request.phone if include_phone else None,  # Full phone only when authenticated
+        'contact_name': request.contact_name,
+        'status': request.status,
+        'helper_id': request.helper_id,
+        'helper_name': request.helper.name if request.helper else None,
+        'priority_score': request.priority_score,
+        'created_at': request.created_at,
+        'updated_at': request.updated_at,
+        'accepted_at': request.accepted_at,
+        'completed_at': request.completed_at,
+        'time_ago': time_ago,
+    }
+
+
 def request_to_response(request: HelpRequest, include_phone: bool = False) -> HelpRequestResponse:
     """Convert database model to response schema"""
-    response = HelpRequestResponse(
-        id=request.id,
-        help_type=request.help_type,
-        description=request.description,
-        urgency=request.urgency,
-        latitude=request.latitude,
-        longitude=request.longitude,
-        address=request.address,
-        phone_masked=mask_phone(request.phone) if request.phone else None,
-        phone=request.phone if include_phone else None,  # Full phone only when authenticated
-        contact_name=request.contact_name,
-        status=request.status,
-        helper_id=request.helper_id,
-        helper_name=request.helper.name if request.helper else None,
-        priority_score=request.priority_score,
-        created_at=request.created_at,
-        updated_at=request.updated_at,
-        accepted_at=request.accepted_at,
-        completed_at=request.completed_at,
-        time_ago=format_time_ago(request.created_at)
+    fields = _base_fields(request, include_phone, format_time_ago(request.created_at))
+    # Values come straight from typed columns, so skip re-validation
+    return HelpRequestResponse.model_construct(**_optional_fields(request, fields))
+
+
+def _row_to_dict(request: HelpRequest, time_ago: str, include_phone: bool = False) -> dict:
+    """
+    Plain-dict twin of request_to_response for the list endpoints.
+    Same keys and values, without building and re-validating a Pydantic model per row.
+    """
+    row = _base_fields(request, include_phone, time_ago)
+    row['distance_km'] = None
+    row.update(dict.fromkeys(_OPTIONAL_FIELDS))
+    return _optional_fields(request, row)
+
+
+def _rows_to_dicts(requests: List[HelpRequest], include_phone: bool = False) -> List[dict]:
+    """_row_to_dict over a page of rows, with every time_ago computed in one batch"""
+    times_ago = format_times_ago([r.created_at for r in requests])
+    return [_row_to_dict(r, t, include_phone) for r, t in zip(requests, times_ago)]
+
+
+def _page(query, offset: int, limit: int, include_phone: bool = False):
+    """(total, response dicts) for one page of a filtered, ordered HelpRequest query"""
+    # Total rides along on every row as COUNT(*) OVER (); assigned helper
+    # comes in via the same query (for helper_name)
+    rows = query.add_columns(func.count().over().label('total')).options(
+        *_RESPONSE_LOAD
+    ).offset(offset).limit(limit).all()
+    if rows:
+        total = rows[0].total
+    else:
+        # Empty page: past the end (still need the real total) or nothing matches
+        total = query.count() if offset else 0
+    return total, _rows_to_dicts([r[0] for r in rows], include_phone)
+
+
+def _page_by_distance(query, lat: float, lon: float, offset: int, limit: int,
+                      include_phone: bool = False):
+    """
+    Like _page, but ordered nearest-first across the whole filtered set.
+    Distances come from one coordinates-only fetch, so the page is cut after
+    sorting by distance; ties keep the query's own ordering.
+    """
+    coords = query.with_entities(HelpRequest.id, HelpRequest.latitude, HelpRequest.longitude).all()
+    distances = haversine_batch(
+        lat, lon,
+        np.fromiter((r.latitude for r in coords), dtype=np.float64, count=len(coords)),
+        np.fromiter((r.longitude for r in coords), dtype=np.float64, count=len(coords)),
     )
-    
-    # Add AI fields if available
-    if hasattr(request, 'ai_priority_score') and request.ai_priority_score is not None:
-        response.ai_priority_score = request.ai_priority_score
-        response.ai_priority_label = request.ai_priority_label
-        response.ai_priority_reason = request.ai_priority_reason
-    
-    if hasattr(request, 'ai_detected_type') and request.ai_detected_type:
-        response.ai_detected_type = request.ai_detected_type
-        response.ai_confidence = request.ai_confidence
-        response.extracted_supplies = request.extracted_supplies
-    
-    if hasattr(request, 'detected_language') and request.detected_language:
-        response.detected_language = request.detected_language
-        response.translated_text = request.translated_text
-        response.simplified_text = request.simplified_text
-    
-    if hasattr(request, 'is_flagged') and request.is_flagged:
-        response.is_flagged = request.is_flagged
-        response.flag_reason = request.flag_reason
-    
-    if hasattr(request, 'duplicate_of_id') and request.duplicate_of_id:
-        response.duplicate_of_id = request.duplicate_of_id
-        response.duplicate_similarity = request.duplicate_similarity
-    
-    # Image evidence
-    if hasattr(request, 'image_urls') and request.image_urls:
-        response.image_urls = request.image_urls
-    
-    # Distress analysis
-    if hasattr(request, 'distress_score') and request.distress_score is not None:
-        response.distress_score = request.distress_score
-        response.distress_indicators = request.distress_indicators
-    
-    # Escalation
-    if hasattr(request, 'escalation_level') and request.escalation_level:
-        response.escalation_level = request.escalation_level
-        response.escalated_at = request.escalated_at
-    
-    return response
+    order = np.argsort(distances, kind='stable')[offset:offset + limit].tolist()
+    page_ids = [coords[i].id for i in order]
+
+    rows = {r.id: r for r in query.options(*_RESPONSE_LOAD).filter(
+        HelpRequest.id.in_(page_ids)
+    ).all()} if page_ids else {}
+    requests = [rows[request_id] for request_id in page_ids if request_id in rows]
+
+    response_list = _rows_to_dicts(requests, include_phone)
+    page_distances = dict(zip(page_ids, distances[order].tolist()))
+    for resp in response_list:
+        resp['distance_km'] = round(page_distances[resp['id']], 2)
+    return len(coords), response_list
+
+
+def _apply_list_filters(query, status: Optional[str], urgency: Optional[str],
+                        help_type: Optional[str], sort_by: str):
+    """List filters and ordering shared by / and /stream (works on Query or select())"""
+    # Apply filters
+    if status and status != 'all':
+        query = query.filter(HelpRequest.status == status)
+    if urgency:
+        query = query.filter(HelpRequest.urgency == urgency)
+    if help_type:
+        query = query.filter(HelpRequest.help_type == help_type)
+
+    # Default: exclude completed/cancelled (unless 'all' requested)
+    if not status:
+        query = query.filter(active_request_filter())
+
+    # Apply sorting
+    if sort_by == "priority":
+        query = query.order_by(desc(HelpRequest.priority_score), HelpRequest.created_at)
+    elif sort_by == "time":
+        query = query.order_by(HelpRequest.created_at)
+    elif sort_by == "urgency":
+        # Precomputed critical < moderate < other ordinal
+        query = query.order_by(HelpRequest.urgency_rank, HelpRequest.created_at)
+
+    return query
+
+
+def _normalize_text(text: Optional[str]) -> str:
+    return ' '.join((text or '').lower().split())
+
+
+def _find_resubmission(request_data: HelpRequestCreate, active: list, since: datetime) -> Optional[int]:
+    """
+    Id of an active request that is the same submission as request_data:
+    same phone, help type and (whitespace/case-normalized) description,
+    within ~500m, created after `since`
+    Never for a submission without a phone: two people at the same spot can
+    send the same text, and merging them would drop a real request
+    """
+    if not request_data.phone:
+        return None
+    description = _normalize_text(request_data.description)
+    for r in active:
+        if (r.created_at >= since
+                and r.phone == request_data.phone
+                and r.help_type == request_data.help_type.value
+                and abs(r.latitude - request_data.latitude) < 0.005
+                and abs(r.longitude - request_data.longitude) < 0.005
+                and _normalize_text(r.description) == description):
+            return r.id
+    return None
+
+
+def _dedup_key(request_data: HelpRequestCreate) -> Optional[str]:
+    """
+    Key for the unique dedup_key index: one open request per submission
+    (phone, help type, ~100m cell, normalized description)
+    None without a phone: different people can send the same text from the
+    same spot, and NULLs never collide in the index
+    """
+    if not request_data.phone:
+        return None
+    raw = '|'.join((
+        request_data.phone,
+        request_data.help_type.value,
+        f"{request_data.latitude:.3f}",
+        f"{request_data.longitude:.3f}",
+        _normalize_text(request_data.description),
+    ))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _resubmission_response(request: HelpRequest) -> ORJSONResponse:
+    """200 (not 201) with the request already stored for this submission"""
+    logger.info(f"Resubmission of request #{request.id}; returning existing request")
+    return ORJSONResponse(request_to_response(request).model_dump(mode='json'), status_code=200)
 
 
 @router.post("/", response_model=HelpRequestResponse, status_code=201)
-async def create_request(
+def create_request(
     request_data: HelpRequestCreate,
     db: Session = Depends(get_db)
 ):
@@ -119,38 +325,45 @@ async def create_request(
         help_type=request_data.help_type.value
     )
     
-    # Get existing requests for duplicate detection
-    existing_requests = db.query(HelpRequest).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled']),
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
+    # One projected fetch of the last 24h feeds duplicate detection and
+    # every spam/repeat counter below
+    now = datetime.utcnow()
+    recent = db.execute(
+        select(
+            HelpRequest.id,
+            HelpRequest.description,
+            HelpRequest.latitude,
+            HelpRequest.longitude,
+            HelpRequest.phone,
+            HelpRequest.help_type,
+            HelpRequest.status,
+            HelpRequest.created_at,
+        ).where(HelpRequest.created_at >= now - timedelta(hours=24))
     ).all()
+    active = [r for r in recent if r.status not in ('completed', 'cancelled')]
+    
+    # Idempotent resubmits (double taps, offline-queue replays): the same
+    # submission again within RESUBMIT_WINDOW returns the request already stored
+    resubmit_id = _find_resubmission(request_data, active, now - RESUBMIT_WINDOW)
+    if resubmit_id is not None:
+        return _resubmission_response(_get_request_with_helper(db, resubmit_id))
+    
+    existing_data = to_duplicate_columns(active)
     
-    existing_data = [{
-        'id': r.id,
-        'description': r.description,
-        'latitude': r.latitude,
-        'longitude': r.longitude,
-        'phone': r.phone,
-        'help_type': r.help_type,
-        'status': r.status
-    } for r in existing_requests]
-    
-    # Count recent requests from same phone
+    # Count recent requests from same phone (list.count runs in C)
     recent_from_phone = 0
     if request_data.phone:
-        recent_from_phone = db.query(HelpRequest).filter(
-            HelpRequest.phone == request_data.phone,
-            HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-        ).count()
-    
-    # Count recent requests from nearby location
-    recent_from_location = db.query(HelpRequest).filter(
-        func.abs(HelpRequest.latitude - request_data.latitude) < 0.01,
-        func.abs(HelpRequest.longitude - request_data.longitude) < 0.01,
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=24)
-    ).count()
-    
-    # Run AI analysis
+        recent_from_phone = [r.phone for r in recent].count(request_data.phone)
+    
+    # Count recent requests from nearby location (one vectorized mask)
+    recent_lat = np.fromiter((r.latitude for r in recent), dtype=np.float64, count=len(recent))
+    recent_lon = np.fromiter((r.longitude for r in recent), dtype=np.float64, count=len(recent))
+    recent_from_location = int((
+        (np.abs(recent_lat - request_data.latitude) < 0.01)
+        & (np.abs(recent_lon - request_data.longitude) < 0.01)
+    ).sum())
+    
+    # Run AI analysis (already off the event loop: this handler runs in the threadpool)
     ai_result = process_request_with_ai(
         request_data={
             'description': request_data.description,
@@ -180,6 +393,9 @@ async def create_request(
         status="requested",
         priority_score=priority,
     )
+    # Naive UTC like every other timestamp set in this router, so the
+    # response built before commit matches the row as it reads back
+    db_request.created_at = db_request.updated_at = datetime.utcnow()
     
     # Apply AI results
     if ai_result.get('priority'):
@@ -239,14 +455,15 @@ async def create_request(
         db_request.review_status = 'pending_review'
     
     # Flag if very close location + same help type within last 6 hours
-    close_same_type = db.query(HelpRequest).filter(
-        func.abs(HelpRequest.latitude - request_data.latitude) < 0.005,
-        func.abs(HelpRequest.longitude - request_data.longitude) < 0.005,
-        HelpRequest.help_type == request_data.help_type.value,
-        HelpRequest.status.notin_(['completed', 'cancelled']),
-        HelpRequest.created_at >= datetime.utcnow() - timedelta(hours=6)
-    ).count()
-    if close_same_type > 0:
+    six_hours_ago = now - timedelta(hours=6)
+    close_same_type = any(
+        abs(r.latitude - request_data.latitude) < 0.005
+        and abs(r.longitude - request_data.longitude) < 0.005
+        and r.help_type == request_data.help_type.value
+        and r.created_at >= six_hours_ago
+        for r in active
+    )
+    if close_same_type:
         db_request.is_flagged = True
         existing_reason = db_request.flag_reason or ''
         dup_reason = f"Similar request ({request_data.help_type.value}) already exists within 500m in last 6h"
@@ -258,9 +475,36 @@ async def create_request(
         db_request.distress_score = ai_result['distress'].get('distress_score', 0)
         db_request.distress_indicators = ai_result['distress'].get('indicators', [])
     
+    # Flush for the new id; the request and both logs commit together below
+    # An identical submission racing this one (both past the check above)
+    # trips the unique dedup_key index; the loser returns the winner's request
+    dedup_key = _dedup_key(request_data)
+    db_request.dedup_key = dedup_key
     db.add(db_request)
-    db.commit()
-    db.refresh(db_request)
+    try:
+        db.flush()
+    except IntegrityError:
+        if dedup_key is None:
+            raise
+        db.rollback()
+        # The index only covers open requests; check anyway before handing one back
+        existing = db.execute(
+            select(HelpRequest).options(joinedload(HelpRequest.helper))
+            .where(HelpRequest.dedup_key == dedup_key, active_request_filter())
+        ).scalar_one_or_none()
+        if existing is None:
+            raise
+        if existing.created_at >= now - RESUBMIT_WINDOW:
+            return _resubmission_response(existing)
+        # Same text as an older request that is still open: not a retry, so
+        # that request gives up the key and this one is stored
+        db.execute(
+            update(HelpRequest)
+            .where(HelpRequest.id == existing.id)
+            .values(dedup_key=None)
+        )
+        db.add(db_request)
+        db.flush()
     
     # Log AI decision
     ai_log = AILog(
@@ -276,7 +520,6 @@ async def create_request(
         explanation=f"AI processing completed in {ai_result.get('processing_time_ms', 0):.1f}ms",
         processing_time_ms=int(ai_result.get('processing_time_ms', 0))
     )
-    db.add(ai_log)
     
     # Log initial status
     status_log = StatusLog(
@@ -285,12 +528,12 @@ async def create_request(
         new_status="requested",
         notes=f"Request created (AI Priority: {db_request.ai_priority_label or 'N/A'})"
     )
-    db.add(status_log)
-    db.commit()
-    
-    # Emit SSE event for new request
-    import asyncio
-    asyncio.create_task(event_bus.publish("new_request", {
+    db.add_all([ai_log, status_log])
+    db.flush()
+    # Everything the response and the event need is loaded now; build them
+    # before commit expires db_request, instead of reloading the row after
+    response = request_to_response(db_request)
+    event = {
         "id": db_request.id,
         "help_type": db_request.help_type,
         "urgency": db_request.urgency,
@@ -302,15 +545,23 @@ async def create_request(
         "ai_priority_label": db_request.ai_priority_label,
         "escalation_level": db_request.escalation_level or 0,
         "created_at": str(db_request.created_at)
-    }))
+    }
+    db.commit()
+    invalidate_recent_requests()
+    invalidate_open_requests()
+    invalidate_request_lists()
+    invalidate_stats()
+    
+    # Emit SSE event for new request (subscriber queues live on the event loop)
+    from_thread.run(event_bus.publish, "new_request", event)
     
-    logger.info(f"New request #{db_request.id} created (priority: {db_request.ai_priority_label})")
+    logger.info(f"New request #{response.id} created (priority: {response.ai_priority_label})")
     
-    return request_to_response(db_request)
+    return response
 
 
-@router.get("/", response_model=HelpRequestList)
-async def get_requests(
+@router.get("/")
+def get_requests(
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     status: Optional[str] = None,
@@ -319,156 +570,165 @@ async def get_requests(
     sort_by: str = Query("priority", pattern="^(priority|time|urgency)$"),
     lat: Optional[float] = None,
     lon: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get paginated list of help requests
     Supports filtering and sorting
     """
-    query = db.query(HelpRequest)
-    
-    # Apply filters
-    if status and status != 'all':
-        query = query.filter(HelpRequest.status == status)
-    if urgency:
-        query = query.filter(HelpRequest.urgency == urgency)
-    if help_type:
-        query = query.filter(HelpRequest.help_type == help_type)
-    
-    # Default: exclude completed/cancelled (unless 'all' requested)
-    if not status:
-        query = query.filter(HelpRequest.status.notin_(['completed', 'cancelled']))
-    
-    # Apply sorting
-    if sort_by == "priority":
-        query = query.order_by(desc(HelpRequest.priority_score), HelpRequest.created_at)
-    elif sort_by == "time":
-        query = query.order_by(HelpRequest.created_at)
-    elif sort_by == "urgency":
-        # Custom ordering for urgency
-        query = query.order_by(
-            func.case(
-                (HelpRequest.urgency == 'critical', 1),
-                (HelpRequest.urgency == 'moderate', 2),
-                else_=3
-            ),
-            HelpRequest.created_at
-        )
-    
-    # Get total count
-    total = query.count()
-    
-    # Paginate
+    # First page without coordinates is what feeds and dashboards poll
+    cache_key = None
+    if page == 1 and lat is None and lon is None:
+        cache_key = (status, urgency, help_type, sort_by, per_page)
+        with _list_cache_lock:
+            cached = _list_cache.get(cache_key)
+        if cached is not None:
+            return Response(content=cached, media_type="application/json")
+    
+    query = _apply_list_filters(db.query(HelpRequest), status, urgency, help_type, sort_by)
+    
+    # Paginate; with coordinates the pages run nearest-first instead
+    # Plain dicts straight to orjson (HelpRequestList shape, no re-validation)
     offset = (page - 1) * per_page
-    requests = query.offset(offset).limit(per_page).all()
-    
-    # Convert to response format
-    response_list = [request_to_response(r) for r in requests]
-    
-    # If coordinates provided, add distance and sort by distance
     if lat is not None and lon is not None:
-        for req in response_list:
-            req_distance = haversine_distance(lat, lon, req.latitude, req.longitude)
-            req.distance_km = round(req_distance, 2)
-        
-        # Sort by distance if coordinates provided
-        response_list.sort(key=lambda r: r.distance_km or 999999)
-    
-    return HelpRequestList(
-        requests=response_list,
-        total=total,
-        page=page,
-        per_page=per_page
-    )
+        total, response_list = _page_by_distance(query, lat, lon, offset, per_page)
+    else:
+        total, response_list = _page(query, offset, per_page)
+    
+    response = ORJSONResponse({
+        'requests': response_list,
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    })
+    if cache_key is not None:
+        with _list_cache_lock:
+            _list_cache[cache_key] = response.body
+    return response
 
 
 @router.get("/for-helper")
-async def get_requests_for_helper(
+def get_requests_for_helper(
     helper_id: int,
     page: int = Query(1, ge=1),
     per_page: int = Query(50, ge=1, le=100),
     lat: Optional[float] = None,
     lon: Optional[float] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get requests with full phone numbers for authenticated helpers
     """
     # Verify helper exists
-    helper = db.query(Helper).filter(Helper.id == helper_id).first()
+    helper = _get_helper(db, helper_id)
     if not helper:
         raise HTTPException(status_code=404, detail="Helper not found")
     
     query = db.query(HelpRequest).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled'])
+        active_request_filter()
     ).order_by(desc(HelpRequest.priority_score), HelpRequest.created_at)
     
-    total = query.count()
+    # Include full phone numbers for authenticated helpers; nearest-first
+    # pages if coordinates provided
     offset = (page - 1) * per_page
-    requests = query.offset(offset).limit(per_page).all()
-    
-    # Include full phone numbers for authenticated helpers
-    response_list = [request_to_response(r, include_phone=True) for r in requests]
-    
-    # Add distance if coordinates provided
     if lat is not None and lon is not None:
-        for req in response_list:
-            req_distance = haversine_distance(lat, lon, req.latitude, req.longitude)
-            req.distance_km = round(req_distance, 2)
-        response_list.sort(key=lambda r: r.distance_km or 999999)
-    
-    return HelpRequestList(
-        requests=response_list,
-        total=total,
-        page=page,
-        per_page=per_page
-    )
+        total, response_list = _page_by_distance(query, lat, lon, offset, per_page, include_phone=True)
+    else:
+        total, response_list = _page(query, offset, per_page, include_phone=True)
+    
+    return ORJSONResponse({
+        'requests': response_list,
+        'total': total,
+        'page': page,
+        'per_page': per_page
+    })
 
 
 @router.get("/nearby")
-async def get_nearby_requests(
+def get_nearby_requests(
     lat: float = Query(..., ge=-90, le=90),
     lon: float = Query(..., ge=-180, le=180),
     radius_km: float = Query(10, ge=1, le=100),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_readonly_db)
 ):
     """
     Get requests within a specified radius
     Used for helper matching
     """
-    # Get all active requests
-    requests = db.query(HelpRequest).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled'])
+    # Just the coordinates of active requests inside the bounding box
+    # (index range scan, no ORM rows for the box corners)...
+    min_lat, max_lat, min_lon, max_lon = bounding_box(lat, lon, radius_km)
+    candidates = db.query(HelpRequest).with_entities(
+        HelpRequest.id, HelpRequest.latitude, HelpRequest.longitude
+    ).filter(
+        HelpRequest.status.notin_(['completed', 'cancelled']),
+        HelpRequest.latitude.between(min_lat, max_lat),
+        HelpRequest.longitude.between(min_lon, max_lon)
     ).all()
     
-    # Filter by distance
-    nearby = []
-    for req in requests:
-        distance = haversine_distance(lat, lon, req.latitude, req.longitude)
-        if distance <= radius_km:
-            resp = request_to_response(req)
-            nearby.append({
-                **resp.model_dump(),
-                'distance_km': round(distance, 2)
-            })
+    # ...then the exact distance check, nearest first...
+    distances = haversine_batch(
+        lat, lon,
+        np.fromiter((r.latitude for r in candidates), dtype=np.float64, count=len(candidates)),
+        np.fromiter((r.longitude for r in candidates), dtype=np.float64, count=len(candidates)),
+    )
+    order = [i for i in np.argsort(distances, kind='stable').tolist() if distances[i] <= radius_km]
+    in_range = [(candidates[i].id, float(distances[i])) for i in order]
+    
+    # ...and full rows only for the requests actually in range
+    rows = {r.id: r for r in db.query(HelpRequest).options(*_RESPONSE_LOAD).filter(
+        HelpRequest.id.in_([request_id for request_id, _ in in_range])
+    ).all()} if in_range else {}
+    in_range = [(rows[request_id], distance) for request_id, distance in in_range if request_id in rows]
     
-    # Sort by distance
-    nearby.sort(key=lambda x: x['distance_km'])
+    nearby = _rows_to_dicts([req for req, _ in in_range])
+    for resp, (_, distance) in zip(nearby, in_range):
+        resp['distance_km'] = round(distance, 2)
     
-    return nearby
+    return ORJSONResponse(nearby)
+
+
+@router.get("/stream")
+def stream_requests(
+    status: Optional[str] = None,
+    urgency: Optional[str] = None,
+    help_type: Optional[str] = None,
+    sort_by: str = Query("priority", pattern="^(priority|time|urgency)$"),
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """
+    Same filters and ordering as GET /, streamed as NDJSON (one request per line)
+    Rows are written as the cursor yields them instead of building the whole list first
+    """
+    stmt = _apply_list_filters(
+        select(HelpRequest).options(*_RESPONSE_LOAD),
+        status, urgency, help_type, sort_by
+    ).limit(limit).execution_options(yield_per=STREAM_BATCH_SIZE)
+    
+    def generate():
+        # Own session: it has to stay open for as long as the response streams
+        db = ReadOnlySessionLocal()
+        try:
+            for batch in db.execute(stmt).scalars().partitions():
+                for row in _rows_to_dicts(batch):
+                    yield orjson.dumps(row) + b"\n"
+        finally:
+            db.close()
+    
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @router.get("/{request_id}", response_model=HelpRequestResponse)
-async def get_request(request_id: int, db: Session = Depends(get_db)):
+def get_request(request_id: int, db: Session = Depends(get_readonly_db)):
     """Get a specific help request by ID"""
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request_with_helper(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     return request_to_response(request)
 
 
 @router.patch("/{request_id}", response_model=HelpRequestResponse)
-async def update_request(
+def update_request(
     request_id: int,
     update_data: HelpRequestUpdate,
     db: Session = Depends(get_db)
@@ -477,7 +737,7 @@ async def update_request(
     Update a help request status
     Used when helper accepts or completes a request
     """
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -495,7 +755,7 @@ async def update_request(
     
     if update_data.helper_id is not None:
         # Verify helper exists
-        helper = db.query(Helper).filter(Helper.id == update_data.helper_id).first()
+        helper = _get_helper(db, update_data.helper_id)
         if not helper:
             raise HTTPException(status_code=400, detail="Helper not found")
         request.helper_id = update_data.helper_id
@@ -520,28 +780,32 @@ async def update_request(
         )
         db.add(status_log)
     
+    # Flush applies updated_at etc.; build the response before commit expires `request`
+    db.flush()
+    response = request_to_response(request)
     db.commit()
-    db.refresh(request)
+    invalidate_recent_requests()
+    invalidate_open_requests()
+    invalidate_request_lists()
+    invalidate_stats()
     
-    return request_to_response(request)
+    return response
 
 
 @router.get("/{request_id}/history", response_model=List[StatusLogResponse])
-async def get_request_history(request_id: int, db: Session = Depends(get_db)):
+def get_request_history(request_id: int, db: Session = Depends(get_readonly_db)):
     """Get status change history for a request"""
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
-    logs = db.query(StatusLog).filter(
-        StatusLog.request_id == request_id
-    ).order_by(StatusLog.created_at).all()
+    logs = _get_status_logs(db, request_id)
     
     return logs
 
 
 @router.post("/{request_id}/accept")
-async def accept_request(
+def accept_request(
     request_id: int,
     helper_id: int,
     db: Session = Depends(get_db)
@@ -550,7 +814,7 @@ async def accept_request(
     Helper accepts a request
     Prevents duplicate handling
     """
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -562,16 +826,22 @@ async def accept_request(
         )
     
     # Verify helper
-    helper = db.query(Helper).filter(Helper.id == helper_id).first()
+    helper = _get_helper(db, helper_id)
     if not helper:
         raise HTTPException(status_code=400, detail="Helper not found")
     
-    # Update request
+    # Claim the request with a guarded UPDATE: of two concurrent accepts only
+    # one can still match status='requested', the other gets 409
     old_status = request.status
-    request.status = "accepted"
-    request.helper_id = helper_id
-    request.accepted_at = datetime.utcnow()
-    request.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(HelpRequest)
+        .where(HelpRequest.id == request_id, HelpRequest.status == 'requested')
+        .values(status="accepted", helper_id=helper_id, accepted_at=now, updated_at=now)
+    ).rowcount
+    if not claimed:
+        db.rollback()
+        raise HTTPException(status_code=409, detail="Request was just accepted by another helper")
     
     # Update helper last active
     helper.last_active = datetime.utcnow()
@@ -586,21 +856,26 @@ async def accept_request(
     )
     db.add(status_log)
     
+    # The ORM-enabled UPDATE already synced its values onto `request`
+    db.flush()
+    response = request_to_response(request)
     db.commit()
-    db.refresh(request)
+    invalidate_open_requests()
+    invalidate_request_lists()
+    invalidate_stats()
     
-    return request_to_response(request)
+    return response
 
 
 @router.post("/{request_id}/complete")
-async def complete_request(
+def complete_request(
     request_id: int,
     helper_id: int,
     notes: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
     """Mark a request as completed"""
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -622,7 +897,7 @@ async def complete_request(
     request.updated_at = datetime.utcnow()
     
     # Update helper stats
-    helper = db.query(Helper).filter(Helper.id == helper_id).first()
+    helper = _get_helper(db, helper_id)
     if helper:
         helper.requests_completed += 1
         helper.last_active = datetime.utcnow()
@@ -637,33 +912,43 @@ async def complete_request(
     )
     db.add(status_log)
     
+    db.flush()
+    response = request_to_response(request)
     db.commit()
-    db.refresh(request)
-    
-    # Emit SSE event
-    import asyncio
-    asyncio.create_task(event_bus.publish("request_completed", {
-        "id": request.id,
+    invalidate_recent_requests()
+    invalidate_open_requests()
+    invalidate_request_lists()
+    invalidate_stats()
+    
+    # Emit SSE event (subscriber queues live on the event loop)
+    from_thread.run(event_bus.publish, "request_completed", {
+        "id": response.id,
         "helper_id": helper_id,
         "status": "completed"
-    }))
+    })
     
-    return request_to_response(request)
+    return response
 
 
 # ============ SSE Real-Time Stream ============
 
 @router.get("/stream/events")
-async def stream_events():
+async def stream_events(request: Request):
     """
     Server-Sent Events endpoint for real-time updates.
     Clients connect and receive events when requests are created, 
     accepted, completed, or escalated.
     """
     async def generate():
-        yield "event: connected\ndata: {\"status\": \"connected\"}\n\n"
-        async for event in event_bus.subscribe():
-            yield event
+        yield b"event: connected\ndata: {\"status\": \"connected\"}\n\n"
+        # aclosing: leaving the loop must unsubscribe now, not whenever the
+        # generator gets collected
+        async with aclosing(event_bus.subscribe()) as events:
+            async for event in events:
+                # Idle moment: stop if the client has gone away
+                if event is EventBus.HEARTBEAT and await request.is_disconnected():
+                    break
+                yield event
 
     return StreamingResponse(
         generate(),
@@ -678,6 +963,16 @@ async def stream_events():
 
 # ============ Image Upload ============
 
+def _upload_size(file: UploadFile) -> int:
+    """Upload size in bytes, without reading the body into memory"""
+    if file.size is not None:
+        return file.size
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
 @router.post("/{request_id}/images")
 async def upload_images(
     request_id: int,
@@ -688,7 +983,9 @@ async def upload_images(
     Upload damage evidence photos for a help request.
     Accepts up to 3 images (JPEG/PNG/WebP), resizes to max 1024px.
     """
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    # Session work (sync) runs in a worker thread; only the file reads and
+    # the image pool are awaited on the event loop
+    request = await asyncio.to_thread(_get_request, db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -698,35 +995,46 @@ async def upload_images(
     ALLOWED_TYPES = {"image/jpeg", "image/png", "image/webp"}
     MAX_SIZE = 5 * 1024 * 1024  # 5MB
     
-    saved_urls = request.image_urls or []
-    
+    # Validate everything before writing anything
     for file in files:
         if file.content_type not in ALLOWED_TYPES:
             raise HTTPException(
                 status_code=400, 
                 detail=f"Invalid file type: {file.content_type}. Allowed: JPEG, PNG, WebP"
             )
-        
-        contents = await file.read()
-        if len(contents) > MAX_SIZE:
+        if _upload_size(file) > MAX_SIZE:
             raise HTTPException(status_code=400, detail="File too large (max 5MB)")
-        
-        # Resize with Pillow
-        img = Image.open(io.BytesIO(contents))
-        img.thumbnail((1024, 1024), Image.Resampling.LANCZOS)
-        
-        # Save
-        filename = f"{request_id}_{uuid.uuid4().hex[:8]}.jpg"
-        filepath = os.path.join(UPLOADS_DIR, filename)
-        os.makedirs(UPLOADS_DIR, exist_ok=True)
-        img.save(filepath, "JPEG", quality=85)
-        
+    
+    # Resize/encode every image at once on the image process pool; the format
+    # is checked from the data itself there, not from the client's content type
+    raws = [await file.read() for file in files]
+    filepaths = [
+        os.path.join(UPLOADS_DIR, f"{request_id}_{uuid.uuid4().hex[:8]}.jpg") for _ in files
+    ]
+    os.makedirs(UPLOADS_DIR, exist_ok=True)
+    results = await asyncio.gather(
+        *(aresize_and_save(raw, path) for raw, path in zip(raws, filepaths)),
+        return_exceptions=True
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if errors:
+        for path in filepaths:
+            if os.path.exists(path):
+                os.remove(path)
+        if isinstance(errors[0], ValueError):
+            raise HTTPException(status_code=400, detail=f"Invalid image: {errors[0]}")
+        raise errors[0]
+    filenames = [os.path.basename(path) for path in filepaths]
+    
+    # New list so the JSON column registers the change
+    saved_urls = list(request.image_urls or [])
+    for filename in filenames:
         saved_urls.append(f"/uploads/{filename}")
         logger.info(f"Image uploaded for request #{request_id}: {filename}")
     
     request.image_urls = saved_urls
-    db.commit()
-    db.refresh(request)
+    await asyncio.to_thread(db.commit)
+    invalidate_request_lists()
     
     return {
         "success": True,
@@ -738,22 +1046,22 @@ async def upload_images(
 # ============ Admin Endpoints ============
 
 @router.get("/admin/flagged")
-async def get_flagged_requests(db: Session = Depends(get_db)):
+def get_flagged_requests(db: Session = Depends(get_readonly_db)):
     """Get all flagged/pending review requests for admin"""
-    flagged = db.query(HelpRequest).filter(
+    flagged = db.query(HelpRequest).options(*_RESPONSE_LOAD).filter(
         HelpRequest.is_flagged == True
     ).order_by(desc(HelpRequest.created_at)).all()
-    return [request_to_response(r) for r in flagged]
+    return ORJSONResponse(_rows_to_dicts(flagged))
 
 
 @router.post("/{request_id}/review")
-async def review_request(
+def review_request(
     request_id: int,
     action: str = Query(..., pattern="^(approve|reject)$"),
     db: Session = Depends(get_db)
 ):
     """Admin reviews a flagged request"""
-    request = db.query(HelpRequest).filter(HelpRequest.id == request_id).first()
+    request = _get_request(db, request_id)
     if not request:
         raise HTTPException(status_code=404, detail="Request not found")
     
@@ -765,5 +1073,9 @@ async def review_request(
         request.status = "cancelled"
     
     db.commit()
+    invalidate_recent_requests()
+    invalidate_open_requests()
+    invalidate_request_lists()
+    invalidate_stats()
     logger.info(f"Request #{request_id} {action}d by admin")
     return {"success": True, "action": action}
\ No newline at end of file
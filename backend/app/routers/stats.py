@@ -5,67 +5,97 @@ Provides overview stats, hazard zones, predictive analytics, and data export
 from fastapi import APIRouter, Depends, Query
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from math import radians, cos, sin, asin, sqrt
-from typing import Optional
+from sqlalchemy import func, case, and_, select
+from bisect import bisect_right
+from typing import Any, Callable, Hashable, List, Optional
 from datetime import datetime, timedelta, timezone
 import csv
 import io
+import tempfile
+import threading
+import numpy as np
+from cachetools import TTLCache
 
-from ..database import get_db
+from ..database import get_readonly_db, ReadOnlySessionLocal, engine
 from ..models import HelpRequest, Helper
 from ..schemas import StatsResponse
+from ..utils import haversine_batch
+from ..services._kernels import greedy_cluster_labels
 from ..logging_config import get_logger
 
 logger = get_logger("stats")
 router = APIRouter(prefix="/stats", tags=["Statistics"])
 
+# Computed dashboard payloads, keyed by endpoint + query params. Dashboards
+# poll these; request/helper writes call invalidate_stats(), and the TTLs
+# bound staleness from background cleanup/escalation and other processes
+_counts_cache: TTLCache = TTLCache(maxsize=8, ttl=30)       # /, /summary
+_zones_cache: TTLCache = TTLCache(maxsize=32, ttl=30)       # hazard/predictive zones
+_analytics_cache: TTLCache = TTLCache(maxsize=1, ttl=300)   # /analytics
+_stats_cache_lock = threading.Lock()
+
+
+def _cached(cache: TTLCache, key: Hashable, compute: Callable[[], Any]) -> Any:
+    """Value for key from cache, computing and storing it on a miss"""
+    with _stats_cache_lock:
+        value = cache.get(key)
+    if value is None:
+        value = compute()
+        with _stats_cache_lock:
+            cache[key] = value
+    return value
+
+
+def invalidate_stats() -> None:
+    """Drop cached stats (after requests or helpers are added or change state)"""
+    with _stats_cache_lock:
+        _counts_cache.clear()
+        _zones_cache.clear()
+        _analytics_cache.clear()
+
 
 @router.get("/", response_model=StatsResponse)
-async def get_stats(db: Session = Depends(get_db)):
+def get_stats(db: Session = Depends(get_readonly_db)):
     """
     Get overall statistics for dashboard
     Used for admin overview and public display
     """
-    # Total requests
-    total_requests = db.query(func.count(HelpRequest.id)).scalar()
-    
-    # Active requests (not completed or cancelled)
-    active_requests = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled'])
-    ).scalar()
-    
-    # Completed requests
-    completed_requests = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.status == 'completed'
-    ).scalar()
-    
-    # Total helpers
-    total_helpers = db.query(func.count(Helper.id)).scalar()
-    
-    # Active helpers
-    active_helpers = db.query(func.count(Helper.id)).filter(
-        Helper.is_active == 1
-    ).scalar()
-    
-    # Requests by type
-    type_counts = db.query(
+    return _cached(_counts_cache, 'stats', lambda: _compute_stats(db))
+
+
+def _compute_stats(db: Session) -> StatsResponse:
+    # Every request counter from one GROUP BY over the (few) combinations of
+    # type, urgency and status, instead of a COUNT query per counter
+    groups = db.query(
         HelpRequest.help_type,
-        func.count(HelpRequest.id)
-    ).group_by(HelpRequest.help_type).all()
-    requests_by_type = {t: c for t, c in type_counts}
-    
-    # Requests by urgency
-    urgency_counts = db.query(
         HelpRequest.urgency,
+        HelpRequest.status,
         func.count(HelpRequest.id)
-    ).group_by(HelpRequest.urgency).all()
-    requests_by_urgency = {u: c for u, c in urgency_counts}
+    ).group_by(HelpRequest.help_type, HelpRequest.urgency, HelpRequest.status).all()
+    
+    total_requests = active_requests = completed_requests = 0
+    requests_by_type = {}
+    requests_by_urgency = {}
+    for help_type, urgency, status, count in groups:
+        total_requests += count
+        # Active requests (not completed or cancelled)
+        if status not in ('completed', 'cancelled'):
+            active_requests += count
+        elif status == 'completed':
+            completed_requests += count
+        requests_by_type[help_type] = requests_by_type.get(help_type, 0) + count
+        requests_by_urgency[urgency] = requests_by_urgency.get(urgency, 0) + count
+    
+    # Total and active helpers in one row
+    total_helpers, active_helpers = db.query(
+        func.count(Helper.id),
+        func.sum(case((Helper.is_active == 1, 1), else_=0))
+    ).one()
     
     return StatsResponse(
-        total_requests=total_requests or 0,
-        active_requests=active_requests or 0,
-        completed_requests=completed_requests or 0,
+        total_requests=total_requests,
+        active_requests=active_requests,
+        completed_requests=completed_requests,
         total_helpers=total_helpers or 0,
         active_helpers=active_helpers or 0,
         requests_by_type=requests_by_type,
@@ -74,25 +104,24 @@ async def get_stats(db: Session = Depends(get_db)):
 
 
 @router.get("/summary")
-async def get_summary(db: Session = Depends(get_db)):
+def get_summary(db: Session = Depends(get_readonly_db)):
     """Quick summary for homepage"""
-    active = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled'])
-    ).scalar()
-    
-    critical = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.status.notin_(['completed', 'cancelled']),
-        HelpRequest.urgency == 'critical'
-    ).scalar()
+    return _cached(_counts_cache, 'summary', lambda: _compute_summary(db))
+
+
+def _compute_summary(db: Session) -> dict:
+    active_status = HelpRequest.status.notin_(['completed', 'cancelled'])
+    active, critical, completed_today = db.query(
+        func.sum(case((active_status, 1), else_=0)),
+        func.sum(case((and_(active_status, HelpRequest.urgency == 'critical'), 1), else_=0)),
+        # Simplified - should filter by date
+        func.sum(case((HelpRequest.status == 'completed', 1), else_=0))
+    ).one()
     
     helpers_online = db.query(func.count(Helper.id)).filter(
         Helper.is_active == 1
     ).scalar()
     
-    completed_today = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.status == 'completed'
-    ).scalar()  # Simplified - should filter by date
-    
     return {
         "active_requests": active or 0,
         "critical_requests": critical or 0,
@@ -101,19 +130,21 @@ async def get_summary(db: Session = Depends(get_db)):
     }
 
 
-def _haversine(lat1, lon1, lat2, lon2):
-    """Distance in km between two lat/lon points."""
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat / 2) ** 2 + cos(lat1) * cos(lat2) * sin(dlon / 2) ** 2
-    return 6371 * 2 * asin(sqrt(a))
+def _greedy_clusters(lats: np.ndarray, lons: np.ndarray, radius_km: float) -> List[np.ndarray]:
+    """
+    Greedy clustering (see greedy_cluster_labels), as index arrays in seed
+    order; each array holds its seed first, then the members ascending.
+    """
+    labels = greedy_cluster_labels(lats, lons, float(radius_km))
+    by_seed = np.argsort(labels, kind='stable')
+    splits = np.flatnonzero(np.diff(labels[by_seed])) + 1
+    return np.split(by_seed, splits)
 
 
 @router.get("/hazard-zones")
-async def get_hazard_zones(
+def get_hazard_zones(
     radius_km: float = Query(5.0, description="Clustering radius in km"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_readonly_db),
 ):
     """
     Compute hazard / disaster zones from active help requests.
@@ -123,6 +154,10 @@ async def get_hazard_zones(
     2. Greedily cluster nearby requests within `radius_km`.
     3. For each cluster compute centre, radius, severity, and counts.
     """
+    return _cached(_zones_cache, ('hazard', radius_km), lambda: _compute_hazard_zones(db, radius_km))
+
+
+def _compute_hazard_zones(db: Session, radius_km: float) -> dict:
     requests = (
         db.query(HelpRequest)
         .filter(HelpRequest.status.notin_(["completed", "cancelled"]))
@@ -146,36 +181,20 @@ async def get_hazard_zones(
     ]
 
     # Greedy clustering
-    used = set()
-    clusters = []
-
-    for i, p in enumerate(points):
-        if i in used:
-            continue
-        cluster = [p]
-        used.add(i)
-        for j, q in enumerate(points):
-            if j in used:
-                continue
-            if _haversine(p["lat"], p["lon"], q["lat"], q["lon"]) <= radius_km:
-                cluster.append(q)
-                used.add(j)
-        clusters.append(cluster)
+    lats = np.fromiter((p["lat"] for p in points), dtype=np.float64, count=len(points))
+    lons = np.fromiter((p["lon"] for p in points), dtype=np.float64, count=len(points))
+    clusters = _greedy_clusters(lats, lons, radius_km)
 
     # Build hazard zone objects
     urgency_weight = {"critical": 3, "moderate": 2, "low": 1}
     zones = []
-    for cluster in clusters:
-        if len(cluster) < 1:
-            continue
+    for idx in clusters:
+        cluster = [points[k] for k in idx]
         center_lat = sum(p["lat"] for p in cluster) / len(cluster)
         center_lon = sum(p["lon"] for p in cluster) / len(cluster)
 
         # Radius = max distance from centre to any point, minimum 0.5 km
-        max_dist = max(
-            _haversine(center_lat, center_lon, p["lat"], p["lon"])
-            for p in cluster
-        )
+        max_dist = float(haversine_batch(center_lat, center_lon, lats[idx], lons[idx]).max())
         zone_radius = max(max_dist + 0.5, 0.5)  # pad a little
 
         # Severity score based on count and urgency mix
@@ -218,9 +237,9 @@ async def get_hazard_zones(
 
 
 @router.get("/predictive-zones")
-async def get_predictive_zones(
+def get_predictive_zones(
     hours_back: int = Query(6, description="Hours of data to analyze"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_readonly_db),
 ):
     """
     Predict emerging disaster zones using request velocity analysis.
@@ -233,6 +252,12 @@ async def get_predictive_zones(
     2. Identify clusters with accelerating request rates
     3. Project growth trajectory to flag emerging hotspots
     """
+    return _cached(
+        _zones_cache, ('predictive', hours_back), lambda: _compute_predictive_zones(db, hours_back)
+    )
+
+
+def _compute_predictive_zones(db: Session, hours_back: int) -> dict:
     cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
     
     requests = db.query(HelpRequest).filter(
@@ -245,33 +270,25 @@ async def get_predictive_zones(
     
     # Split into time windows (divide period into 3 windows)
     window_size = timedelta(hours=hours_back / 3)
-    windows = []
-    for i in range(3):
-        start = cutoff + window_size * i
-        end = start + window_size
-        window_reqs = [r for r in requests 
-                       if r.created_at and start <= r.created_at.replace(tzinfo=timezone.utc) < end]
-        windows.append(window_reqs)
+    bounds = [cutoff + window_size * i for i in range(4)]
+    window_of = np.fromiter(
+        (bisect_right(bounds, r.created_at.replace(tzinfo=timezone.utc)) - 1 if r.created_at else -1
+         for r in requests),
+        dtype=np.int64, count=len(requests)
+    )
+    window_masks = [window_of == i for i in range(3)]
     
     # Cluster recent requests geographically
-    points = [{"lat": r.latitude, "lon": r.longitude, "created": r.created_at, "urgency": r.urgency, "id": r.id} 
+    points = [{"lat": r.latitude, "lon": r.longitude, "urgency": r.urgency, "id": r.id}
               for r in requests]
     
-    used = set()
-    clusters = []
-    for i, p in enumerate(points):
-        if i in used:
-            continue
-        cluster = [p]
-        used.add(i)
-        for j, q in enumerate(points):
-            if j in used:
-                continue
-            if _haversine(p["lat"], p["lon"], q["lat"], q["lon"]) <= 3.0:  # 3km radius
-                cluster.append(q)
-                used.add(j)
-        if len(cluster) >= 2:
-            clusters.append(cluster)
+    lats = np.fromiter((p["lat"] for p in points), dtype=np.float64, count=len(points))
+    lons = np.fromiter((p["lon"] for p in points), dtype=np.float64, count=len(points))
+    clusters = [
+        [points[k] for k in idx]
+        for idx in _greedy_clusters(lats, lons, 3.0)  # 3km radius
+        if len(idx) >= 2
+    ]
     
     predicted = []
     for cluster in clusters:
@@ -279,12 +296,9 @@ async def get_predictive_zones(
         center_lon = sum(p["lon"] for p in cluster) / len(cluster)
         
         # Calculate request velocity (requests per hour in each window)
-        velocities = []
-        for window_reqs in windows:
-            count = sum(1 for r in window_reqs 
-                       for p in cluster 
-                       if _haversine(r.latitude, r.longitude, center_lat, center_lon) <= 3.0)
-            velocities.append(count)
+        # (each in-range request counts once per cluster member)
+        near = haversine_batch(center_lat, center_lon, lats, lons) <= 3.0
+        velocities = [int(np.count_nonzero(near & mask)) * len(cluster) for mask in window_masks]
         
         # Check if accelerating (each window has more than previous)
         is_accelerating = (len(velocities) >= 2 and velocities[-1] > velocities[0])
@@ -318,24 +332,38 @@ async def get_predictive_zones(
 
 
 @router.get("/analytics")
-async def get_analytics(db: Session = Depends(get_db)):
+def get_analytics(db: Session = Depends(get_readonly_db)):
     """
     Detailed analytics for admin dashboard.
     Returns time-series data, response times, and helper leaderboard.
     """
-    # Requests by day (last 7 days)
-    daily_counts = []
-    for i in range(7):
-        day_start = datetime.now(timezone.utc) - timedelta(days=i+1)
-        day_end = datetime.now(timezone.utc) - timedelta(days=i)
-        count = db.query(func.count(HelpRequest.id)).filter(
-            HelpRequest.created_at >= day_start,
-            HelpRequest.created_at < day_end
-        ).scalar() or 0
-        daily_counts.append({
-            "date": day_start.strftime("%Y-%m-%d"),
-            "count": count
-        })
+    return _cached(_analytics_cache, 'analytics', lambda: _compute_analytics(db))
+
+
+def _compute_analytics(db: Session) -> dict:
+    # Requests by day (last 7 days, as rolling 24h windows back from now),
+    # plus the escalated/flagged/total counters, all from one aggregate row
+    now = datetime.now(timezone.utc)
+    day_starts = [now - timedelta(days=i + 1) for i in range(7)]
+    counters = db.query(
+        *(
+            func.sum(case((and_(HelpRequest.created_at >= start,
+                                HelpRequest.created_at < start + timedelta(days=1)), 1), else_=0))
+            for start in day_starts
+        ),
+        # Escalated count
+        func.sum(case((and_(HelpRequest.escalation_level > 0,
+                            HelpRequest.status.notin_(["completed", "cancelled"])), 1), else_=0)),
+        # Flagged count
+        func.sum(case((HelpRequest.is_flagged == True, 1), else_=0)),
+        func.count(HelpRequest.id)
+    ).one()
+    *day_counts, escalated, flagged, total_requests = counters
+    
+    daily_counts = [
+        {"date": start.strftime("%Y-%m-%d"), "count": count or 0}
+        for start, count in zip(day_starts, day_counts)
+    ]
     daily_counts.reverse()
     
     # Average response time (accepted_at - created_at)
@@ -373,55 +401,113 @@ async def get_analytics(db: Session = Depends(get_db)):
         func.count(HelpRequest.id)
     ).group_by(HelpRequest.help_type).all()
     
-    # Escalated count
-    escalated = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.escalation_level > 0,
-        HelpRequest.status.notin_(["completed", "cancelled"])
-    ).scalar() or 0
-    
-    # Flagged count
-    flagged = db.query(func.count(HelpRequest.id)).filter(
-        HelpRequest.is_flagged == True
-    ).scalar() or 0
-    
     return {
         "daily_requests": daily_counts,
         "avg_response_time_mins": avg_response_mins,
         "helper_leaderboard": leaderboard,
         "category_breakdown": {t: c for t, c in type_counts},
-        "escalated_count": escalated,
-        "flagged_count": flagged,
-        "total_requests": db.query(func.count(HelpRequest.id)).scalar() or 0,
+        "escalated_count": escalated or 0,
+        "flagged_count": flagged or 0,
+        "total_requests": total_requests or 0,
         "total_helpers": db.query(func.count(Helper.id)).scalar() or 0
     }
 
 
+# Columns of the CSV export, in order, with their header labels
+_EXPORT_COLUMNS = [
+    ("ID", HelpRequest.id),
+    ("Help Type", HelpRequest.help_type),
+    ("Urgency", HelpRequest.urgency),
+    ("Status", HelpRequest.status),
+    ("Description", HelpRequest.description),
+    ("Latitude", HelpRequest.latitude),
+    ("Longitude", HelpRequest.longitude),
+    ("Address", HelpRequest.address),
+    ("Priority Score", HelpRequest.priority_score),
+    ("AI Priority Label", HelpRequest.ai_priority_label),
+    ("Distress Score", HelpRequest.distress_score),
+    ("Escalation Level", HelpRequest.escalation_level),
+    ("Created At", HelpRequest.created_at),
+    ("Accepted At", HelpRequest.accepted_at),
+    ("Completed At", HelpRequest.completed_at),
+]
+_EXPORT_DESCRIPTION = 4  # position of the description, truncated to 200 chars
+
+EXPORT_BATCH_SIZE = 1000
+
+# On Postgres (psycopg2) the server writes the CSV itself via COPY; the result
+# is spooled in memory up to this size, then on disk, and sent in chunks
+_COPY_EXPORT = engine.dialect.name == "postgresql" and engine.dialect.driver == "psycopg2"
+EXPORT_SPOOL_BYTES = 8 * 1024 * 1024
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+def _export_copy_sql() -> str:
+    """COPY ... TO STDOUT statement producing the same columns and header as the Python export"""
+    query = select(*(
+        (func.substr(func.coalesce(column, ""), 1, 200) if i == _EXPORT_DESCRIPTION else column).label(label)
+        for i, (label, column) in enumerate(_EXPORT_COLUMNS)
+    )).order_by(HelpRequest.created_at.desc())
+    sql = query.compile(engine, compile_kwargs={"literal_binds": True})
+    return f"COPY ({sql}) TO STDOUT WITH CSV HEADER"
+
+
 @router.get("/export")
-async def export_data(db: Session = Depends(get_db)):
+def export_data():
     """Export all request data as CSV for disaster coordination teams"""
-    requests = db.query(HelpRequest).order_by(HelpRequest.created_at.desc()).all()
-    
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "ID", "Help Type", "Urgency", "Status", "Description", 
-        "Latitude", "Longitude", "Address", "Priority Score",
-        "AI Priority Label", "Distress Score", "Escalation Level",
-        "Created At", "Accepted At", "Completed At"
-    ])
+    if _COPY_EXPORT:
+        generate = _generate_export_copy
+    else:
+        generate = _generate_export_rows
     
-    for r in requests:
-        writer.writerow([
-            r.id, r.help_type, r.urgency, r.status, 
-            (r.description or "")[:200], r.latitude, r.longitude,
-            r.address, r.priority_score, r.ai_priority_label,
-            r.distress_score, r.escalation_level,
-            r.created_at, r.accepted_at, r.completed_at
-        ])
-    
-    output.seek(0)
     return StreamingResponse(
-        iter([output.getvalue()]),
+        generate(),
         media_type="text/csv",
         headers={"Content-Disposition": "attachment; filename=relieflink_export.csv"}
-    )
\ No newline at end of file
+    )
+
+
+def _generate_export_copy():
+    """Postgres: COPY ... TO STDOUT serializes the CSV server-side"""
+    # Own session: it has to stay open for as long as the response streams
+    db = ReadOnlySessionLocal()
+    try:
+        with tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_BYTES) as out:
+            cursor = db.connection().connection.cursor()
+            try:
+                cursor.copy_expert(_export_copy_sql(), out)
+            finally:
+                cursor.close()
+            out.seek(0)
+            while chunk := out.read(EXPORT_CHUNK_BYTES):
+                yield chunk
+    finally:
+        db.close()
+
+
+def _generate_export_rows():
+    """Fallback (SQLite, other drivers): CSV written in Python, one chunk per batch of rows"""
+    stmt = (
+        select(*(column for _, column in _EXPORT_COLUMNS))
+        .order_by(HelpRequest.created_at.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow([label for label, _ in _EXPORT_COLUMNS])
+    yield output.getvalue()
+    
+    # Own session: it has to stay open for as long as the response streams
+    db = ReadOnlySessionLocal()
+    try:
+        for batch in db.execute(stmt).partitions():
+            output.seek(0)
+            output.truncate()
+            for r in batch:
+                row = list(r)
+                row[_EXPORT_DESCRIPTION] = (row[_EXPORT_DESCRIPTION] or "")[:200]
+                writer.writerow(row)
+            yield output.getvalue()
+    finally:
+        db.close()
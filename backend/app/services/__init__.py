@@ -4,6 +4,7 @@ from .ai_service import (
     auto_categorize_request,
     translate_and_simplify,
     check_for_duplicates,
+    to_duplicate_columns,
     check_for_spam,
     get_helper_recommendations,
     process_request_with_ai,
@@ -21,6 +22,7 @@ __all__ = [
     'auto_categorize_request',
     'translate_and_simplify',
     'check_for_duplicates',
+    'to_duplicate_columns',
     'check_for_spam',
     'get_helper_recommendations',
     'process_request_with_ai',
@@ -0,0 +1,129 @@
+"""
+Numeric kernels for ReliefLink services
+=======================================
+Tight arithmetic that runs once per row on hot paths (distance checks
+during duplicate detection, helper matching, dashboards and zone clustering). Signatures
+are given eagerly so compilation (or the on-disk cache load) happens at
+import time rather than on the first request.
+
+Compiled to native code with Numba when it is installed; otherwise the
+same functions run as plain Python, so Numba is an optional speedup and
+never a hard requirement.
+"""
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        """Pass-through stand-in for numba.njit"""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+EARTH_RADIUS_KM = 6371.0
+
+
+@njit("float64(float64, float64, float64, float64)", cache=True, fastmath=True)
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance in km between two GPS coordinates."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lon = math.radians(lon2 - lon1)
+
+    a = (math.sin(delta_lat / 2) ** 2 +
+         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon / 2) ** 2)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+@njit("float64[:](float64, float64, float64[:], float64[:])", cache=True, fastmath=True)
+def haversine_batch(lat1, lon1, lat_arr, lon_arr):
+    """Distances in km from one point to arrays of coordinates."""
+    lat1_rad = math.radians(lat1)
+    lat2_rad = np.radians(lat_arr)
+    delta_lat = lat2_rad - lat1_rad
+    delta_lon = np.radians(lon_arr - lon1)
+
+    a = (np.sin(delta_lat / 2) ** 2 +
+         math.cos(lat1_rad) * np.cos(lat2_rad) * np.sin(delta_lon / 2) ** 2)
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+    return EARTH_RADIUS_KM * c
+
+
+@njit("void(float64[:], float64[:], float64, boolean[:], boolean[:], float64[:])",
+      cache=True, fastmath=True)
+def score_recommendations(priority, distance, max_dist, skill_mask, critical_mask, out):
+    """
+    Smart-recommendation match score per request, written into out:
+    40% priority + up to 30 for proximity + 20 for a skill match
+    + 10 for critical urgency. Numba fuses the expression into one
+    loop; without it this is a plain NumPy expression. Single-threaded:
+    inputs are capped at a few hundred rows, and it is called from
+    FastAPI's threadpool.
+    """
+    out[:] = (priority * 0.4 +
+              (1 - distance / max_dist) * 30 +
+              skill_mask * 20.0 +
+              critical_mask * 10.0)
+
+
+@njit("int64[:](float64[:], float64[:], float64)", cache=True, fastmath=True)
+def greedy_cluster_labels(lats, lons, radius_km):
+    """
+    Greedy radius clustering: each unassigned point, in index order, seeds
+    a cluster and takes every unassigned point within radius_km of it.
+    Returns, per point, the index of its cluster's seed.
+
+    Candidates come from a latitude-sorted band (anything within radius_km
+    is within radius_km / R radians of latitude) and are tested with an
+    equirectangular distance, which is exact enough at zone scale.
+    """
+    n = lats.shape[0]
+    km_per_deg = EARTH_RADIUS_KM * math.pi / 180.0
+    band = radius_km / km_per_deg
+    radius_sq = radius_km * radius_km
+    order = np.argsort(lats)
+    sorted_lats = lats[order]
+    labels = np.full(n, -1, dtype=np.int64)
+
+    for i in range(n):
+        if labels[i] >= 0:
+            continue
+        labels[i] = i
+        lo = np.searchsorted(sorted_lats, lats[i] - band, side='left')
+        hi = np.searchsorted(sorted_lats, lats[i] + band, side='right')
+        km_per_deg_lon = km_per_deg * math.cos(math.radians(lats[i]))
+        for k in range(lo, hi):
+            j = order[k]
+            if labels[j] >= 0:
+                continue
+            dy = (lats[j] - lats[i]) * km_per_deg
+            dx = (lons[j] - lons[i]) * km_per_deg_lon
+            if dy * dy + dx * dx <= radius_sq:
+                labels[j] = i
+
+    return labels
+
+
+def warm_up() -> None:
+    """
+    Run every kernel once on dummy inputs. Signatures already compile at
+    import; this also pays the one-off dispatch cost so the first real
+    request doesn't.
+    """
+    coords = np.zeros(1)
+    flags = np.zeros(1, dtype=np.bool_)
+    haversine_km(0.0, 0.0, 0.0, 0.0)
+    haversine_batch(0.0, 0.0, coords, coords)
+    score_recommendations(coords, coords, 10.0, flags, flags, np.empty(1))
+    greedy_cluster_labels(coords, coords, 1.0)
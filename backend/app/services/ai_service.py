@@ -18,12 +18,17 @@ Design Principles:
 import re
 import time
 import math
+import heapq
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass
 from functools import lru_cache
 import json
 
+import numpy as np
+
+from ._kernels import haversine_km, haversine_batch
+
 # Translation cache to reduce API calls
 _translation_cache: Dict[str, str] = {}
 
@@ -456,9 +461,36 @@ def simplify_text(text: str) -> str:
 # 4. DUPLICATE DETECTION
 # ============================================================
 
+def to_duplicate_columns(rows: List[Any]) -> Dict[str, Any]:
+    """
+    Build the column (structure-of-arrays) layout check_for_duplicates expects
+    from row objects with attribute access (ORM rows or Row tuples).
+    Coordinates and ids become NumPy arrays; text fields stay lists.
+    """
+    # One pass over the rows, transposed into per-column tuples
+    columns = tuple(zip(*(
+        (r.id, r.latitude, r.longitude, r.description, r.phone, r.help_type, r.status)
+        for r in rows
+    ))) or ((),) * 7
+    ids, latitudes, longitudes, descriptions, phones, help_types, statuses = columns
+    return {
+        'id': np.array(ids, dtype=np.int64),
+        'latitude': np.array(latitudes, dtype=np.float64),
+        'longitude': np.array(longitudes, dtype=np.float64),
+        'description': list(descriptions),
+        'phone': list(phones),
+        'help_type': list(help_types),
+        'status': list(statuses),
+    }
+
+
+# Most a request outside the radius, without a phone match, can score (text 0.3 + help type 0.1)
+_FAR_MAX_SIMILARITY = 0.4
+
+
 def check_for_duplicates(
     new_request: Dict,
-    existing_requests: List[Dict],
+    existing_requests: Dict[str, Any],
     location_radius_km: float = 0.5,
     time_window_hours: int = 24,
     text_similarity_threshold: float = 0.7
@@ -466,12 +498,21 @@ def check_for_duplicates(
     """
     Check if a new request is a potential duplicate.
     
+    existing_requests is column-oriented (see to_duplicate_columns):
+    one array/list per field, all the same length.
+    
     Criteria:
     - Location within radius_km
     - Created within time_window_hours
     - Text similarity above threshold
+    
+    Rows with a phone match or inside the radius are scored first. Any
+    other row gets at most 0.4 (text + help type), so it can't reach the
+    threshold; it is only scored when it could still be the best match
+    reported in similarity_score/reasons.
     """
-    if not existing_requests:
+    n = len(existing_requests['id']) if existing_requests else 0
+    if not n:
         return AIDuplicateResult(
             is_duplicate=False,
             duplicate_of_id=None,
@@ -483,36 +524,40 @@ def check_for_duplicates(
     new_lon = new_request.get('longitude', 0)
     new_text = (new_request.get('description', '') or '').lower()
     new_phone = new_request.get('phone', '')
+    new_help_type = new_request.get('help_type')
     
-    best_match_id = None
-    best_similarity = 0.0
-    match_reasons = []
+    # Location and phone checks for every candidate at once
+    distances = haversine_batch(
+        new_lat, new_lon,
+        np.asarray(existing_requests['latitude'], dtype=np.float64),
+        np.asarray(existing_requests['longitude'], dtype=np.float64),
+    )
+    in_radius = distances < location_radius_km
+    proximity = np.where(in_radius, 1 - distances / location_radius_km, 0.0)
+    phone_match = (np.asarray(existing_requests['phone'], dtype=object) == new_phone
+                   if new_phone else np.zeros(n, dtype=bool))
+    
+    ids = existing_requests['id']
+    descriptions = existing_requests['description']
+    help_types = existing_requests['help_type']
+    statuses = existing_requests.get('status')
     
-    for req in existing_requests:
+    def score(i: int) -> Tuple[float, List[str]]:
         similarity = 0.0
         reasons = []
         
-        # Skip completed/cancelled requests
-        if req.get('status') in ['completed', 'cancelled']:
-            continue
-        
         # Check phone match (strong indicator)
-        if new_phone and req.get('phone') == new_phone:
+        if phone_match[i]:
             similarity += 0.5
             reasons.append("Same phone number")
         
         # Check location proximity
-        req_lat = req.get('latitude', 0)
-        req_lon = req.get('longitude', 0)
-        distance = haversine_distance(new_lat, new_lon, req_lat, req_lon)
-        
-        if distance < location_radius_km:
-            proximity_score = 1 - (distance / location_radius_km)
-            similarity += proximity_score * 0.3
-            reasons.append(f"Location {distance:.2f}km away")
+        if in_radius[i]:
+            similarity += float(proximity[i]) * 0.3
+            reasons.append(f"Location {distances[i]:.2f}km away")
         
         # Check text similarity (simple Jaccard)
-        req_text = (req.get('description', '') or '').lower()
+        req_text = (descriptions[i] or '').lower()
         if new_text and req_text:
             text_sim = jaccard_similarity(new_text, req_text)
             if text_sim > 0.3:
@@ -520,15 +565,38 @@ def check_for_duplicates(
                 reasons.append(f"Text {text_sim*100:.0f}% similar")
         
         # Check help type match
-        if req.get('help_type') == new_request.get('help_type'):
+        if help_types[i] == new_help_type:
             similarity += 0.1
             reasons.append("Same help type")
         
-        # Update best match
-        if similarity > best_similarity:
-            best_similarity = similarity
-            best_match_id = req.get('id')
-            match_reasons = reasons
+        return similarity, reasons
+    
+    best_index = None
+    best_similarity = 0.0
+    match_reasons = []
+    
+    def consider(rows: np.ndarray) -> None:
+        # Highest score wins; on a tie the earlier row (as a single pass in row order would)
+        nonlocal best_index, best_similarity, match_reasons
+        for i in rows.tolist():
+            # Skip completed/cancelled requests
+            if statuses is not None and statuses[i] in ['completed', 'cancelled']:
+                continue
+            similarity, reasons = score(i)
+            if similarity > best_similarity or (
+                    similarity == best_similarity and best_index is not None and i < best_index):
+                best_index, best_similarity, match_reasons = i, similarity, reasons
+    
+    near = in_radius | phone_match
+    consider(np.flatnonzero(near))
+    
+    # The rest can't be duplicates, but can still be the best (reported) match
+    if best_similarity <= _FAR_MAX_SIMILARITY:
+        type_match = np.asarray(help_types, dtype=object) == new_help_type
+        upper = np.where(type_match, _FAR_MAX_SIMILARITY, _FAR_MAX_SIMILARITY - 0.1)
+        consider(np.flatnonzero(~near & (upper >= best_similarity)))
+    
+    best_match_id = int(ids[best_index]) if best_index is not None else None
     
     is_duplicate = best_similarity >= text_similarity_threshold
     
@@ -556,24 +624,20 @@ def jaccard_similarity(text1: str, text2: str) -> float:
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance in km between two GPS coordinates."""
-    R = 6371  # Earth's radius in km
-    
-    lat1_rad = math.radians(lat1)
-    lat2_rad = math.radians(lat2)
-    delta_lat = math.radians(lat2 - lat1)
-    delta_lon = math.radians(lon2 - lon1)
-    
-    a = (math.sin(delta_lat/2)**2 + 
-         math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(delta_lon/2)**2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    
-    return R * c
+    # Numba-compiled when available (see _kernels)
+    return haversine_km(lat1, lon1, lat2, lon2)
 
 
 # ============================================================
 # 5. SPAM/FAKE DETECTION
 # ============================================================
 
+# Recent-request counts at which check_for_spam flags a request; callers may
+# stop counting once these are reached
+SPAM_PHONE_THRESHOLD = 5
+SPAM_LOCATION_THRESHOLD = 10
+
+
 def check_for_spam(
     request: Dict,
     recent_requests_from_phone: int = 0,
@@ -597,12 +661,12 @@ def check_for_spam(
     confidence = 0.0
     
     # Check for too many recent requests from same phone
-    if recent_requests_from_phone >= 5:
+    if recent_requests_from_phone >= SPAM_PHONE_THRESHOLD:
         flag_reasons.append(f"Multiple requests ({recent_requests_from_phone}) from same phone")
         confidence += 0.3
     
     # Check for too many requests from same location
-    if recent_requests_from_location >= 10:
+    if recent_requests_from_location >= SPAM_LOCATION_THRESHOLD:
         flag_reasons.append(f"Many requests ({recent_requests_from_location}) from same location")
         confidence += 0.2
     
@@ -725,9 +789,8 @@ def get_helper_recommendations(
                 match_reasons=reasons
             ))
     
-    # Sort by score (descending) and return top N
-    scored_helpers.sort(key=lambda x: x.match_score, reverse=True)
-    return scored_helpers[:top_n]
+    # Top N by score (descending) without sorting the rest
+    return heapq.nlargest(top_n, scored_helpers, key=lambda x: x.match_score)
 
 
 # ============================================================
@@ -801,9 +864,22 @@ def analyze_distress(description: str) -> dict:
     }
 
 
+# Categorization and distress analysis depend only on the text (and selected
+# type), so reposts and retries of the same description reuse the first result.
+# Callers get copies of the mutable parts.
+@lru_cache(maxsize=4096)
+def _categorize_cached(description: str, help_type: str) -> AICategoryResult:
+    return auto_categorize_request(description=description, user_selected_type=help_type)
+
+
+@lru_cache(maxsize=4096)
+def _distress_cached(description: str) -> dict:
+    return analyze_distress(description)
+
+
 def process_request_with_ai(
     request_data: Dict,
-    existing_requests: List[Dict] = None,
+    existing_requests: Dict[str, Any] = None,
     recent_from_phone: int = 0,
     recent_from_location: int = 0
 ) -> Dict[str, Any]:
@@ -854,14 +930,11 @@ def process_request_with_ai(
     
     # 2. Auto categorization
     try:
-        category_result = auto_categorize_request(
-            description=description,
-            user_selected_type=help_type
-        )
+        category_result = _categorize_cached(description, help_type)
         results['category'] = {
             'detected_type': category_result.detected_type,
             'confidence': category_result.confidence,
-            'supplies': category_result.extracted_supplies,
+            'supplies': list(category_result.extracted_supplies),
             'needs_confirmation': category_result.needs_confirmation
         }
     except Exception as e:
@@ -881,7 +954,7 @@ def process_request_with_ai(
     
     # 4. Duplicate detection
     try:
-        if existing_requests:
+        if existing_requests and len(existing_requests['id']):
             duplicate_result = check_for_duplicates(
                 new_request=request_data,
                 existing_requests=existing_requests
@@ -912,7 +985,12 @@ def process_request_with_ai(
     
     # 6. Distress analysis
     try:
-        distress_result = analyze_distress(description)
+        distress_result = _distress_cached(description)
+        distress_result = {
+            **distress_result,
+            'indicators': list(distress_result['indicators']),
+            'categories_detected': list(distress_result['categories_detected']),
+        }
         results['distress'] = distress_result
         # Boost priority if high distress detected
         if distress_result['distress_score'] > 0.5 and results.get('priority'):
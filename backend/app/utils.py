@@ -3,8 +3,14 @@ Utility functions for ReliefLink
 Includes: distance calculation, phone masking, time formatting, priority scoring
 """
 from datetime import datetime, timedelta
-from math import radians, cos, sin, asin, sqrt
-from typing import Optional
+from bisect import bisect_right
+from functools import lru_cache
+from math import radians, cos
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .services._kernels import haversine_km, haversine_batch
 
 
 def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
@@ -13,25 +19,27 @@ def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> fl
     on the earth (specified in decimal degrees)
     Returns distance in kilometers
     """
-    # Convert to radians
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    
-    # Haversine formula
-    dlat = lat2 - lat1
-    dlon = lon2 - lon1
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    
-    # Earth's radius in kilometers
-    r = 6371
-    
-    return c * r
+    return haversine_km(lat1, lon1, lat2, lon2)
 
 
+def bounding_box(lat: float, lon: float, radius_km: float) -> Tuple[float, float, float, float]:
+    """
+    Lat/lon box enclosing a circle of radius_km around a point
+    Returns (min_lat, max_lat, min_lon, max_lon) - cheap, indexable
+    prefilter to run before the exact haversine check
+    """
+    dlat = radius_km / 111.0
+    # Longitude degrees shrink with latitude; clamp so the poles don't divide by zero
+    dlon = radius_km / (111.0 * max(cos(radians(lat)), 0.01))
+    return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+
+@lru_cache(maxsize=8192)
 def mask_phone(phone: Optional[str]) -> Optional[str]:
     """
     Mask phone number for privacy
     Example: +1234567890 -> +123****890
+    Cached: list pages repeat the same few numbers
     """
     if not phone or len(phone) < 6:
         return phone
@@ -44,30 +52,56 @@ def mask_phone(phone: Optional[str]) -> Optional[str]:
     return f"{visible_start}{masked_middle}{visible_end}"
 
 
-def format_time_ago(dt: datetime) -> str:
+# format_time_ago buckets: seconds upper bound, divisor, unit
+_TIME_AGO_BOUNDS_LIST = [60, 3600, 86400]
+_TIME_AGO_BOUNDS = np.array(_TIME_AGO_BOUNDS_LIST, dtype=np.float64)
+_TIME_AGO_UNITS = ((1, None), (60, "min"), (3600, "hour"), (86400, "day"))
+
+
+@lru_cache(maxsize=1024)
+def _time_ago_label(bucket: int, count: int) -> str:
+    unit = _TIME_AGO_UNITS[bucket][1]
+    if unit is None:
+        return "Just now"
+    return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+
+def format_time_ago(dt: datetime, now: Optional[datetime] = None) -> str:
     """
     Format datetime as human-readable time ago
     Example: "5 minutes ago", "2 hours ago"
+    Pass `now` (naive UTC) when formatting many rows to read the clock once
     """
     if not dt:
         return "Unknown"
     
-    now = datetime.utcnow()
-    diff = now - dt
-    
-    seconds = diff.total_seconds()
+    if now is None:
+        now = datetime.utcnow()
+    seconds = (now - dt).total_seconds()
     
-    if seconds < 60:
-        return "Just now"
-    elif seconds < 3600:
-        minutes = int(seconds / 60)
-        return f"{minutes} min{'s' if minutes > 1 else ''} ago"
-    elif seconds < 86400:
-        hours = int(seconds / 3600)
-        return f"{hours} hour{'s' if hours > 1 else ''} ago"
-    else:
-        days = int(seconds / 86400)
-        return f"{days} day{'s' if days > 1 else ''} ago"
+    bucket = bisect_right(_TIME_AGO_BOUNDS_LIST, seconds)
+    count = int(seconds // _TIME_AGO_UNITS[bucket][0]) if bucket else 0
+    return _time_ago_label(bucket, count)
+
+
+def format_times_ago(dts: Sequence[Optional[datetime]]) -> List[str]:
+    """
+    format_time_ago over a whole page of timestamps at once
+    Ages are computed with one vectorized subtraction; each distinct label is formatted once
+    """
+    if not dts:
+        return []
+    created = np.array(dts, dtype='datetime64[us]')
+    now = np.datetime64(datetime.utcnow(), 'us')
+    seconds = (now - created) / np.timedelta64(1, 's')
+    buckets = np.searchsorted(_TIME_AGO_BOUNDS, seconds, side='right')
+    divisors = np.array([d for d, _ in _TIME_AGO_UNITS], dtype=np.float64)[buckets]
+    counts = np.floor_divide(seconds, divisors)
+    missing = np.isnat(created)
+    return [
+        "Unknown" if unknown else _time_ago_label(bucket, int(count))
+        for bucket, count, unknown in zip(buckets.tolist(), counts.tolist(), missing.tolist())
+    ]
 
 
 def calculate_priority_score(
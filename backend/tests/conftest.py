@@ -0,0 +1,43 @@
+"""
+Test fixtures: the app runs against a throwaway SQLite database, configured
+through the environment before anything from app is imported
+"""
+import itertools
+import os
+import shutil
+import tempfile
+
+import pytest
+
+_DB_DIR = tempfile.mkdtemp(prefix="relieflink-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_DB_DIR, 'test.db')}"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.main import app  # noqa: E402
+
+# Every test gets numbers nobody else has used
+_phone_numbers = itertools.count(9000000000)
+
+
+def new_phone() -> str:
+    return f"+91{next(_phone_numbers)}"
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as c:
+        yield c
+    shutil.rmtree(_DB_DIR, ignore_errors=True)
+
+
+@pytest.fixture
+def make_helper(client):
+    """Register a helper; returns its id"""
+    def _make(name: str = "Helper") -> int:
+        r = client.post("/api/helpers/", json={"name": name, "phone": new_phone()})
+        assert r.status_code == 201, r.text
+        return r.json()["id"]
+    
+    return _make
@@ -0,0 +1,126 @@
+"""
+Races on help requests: concurrent accepts and resubmitted creates
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.database import SessionLocal
+from app.models import HelpRequest
+from app.routers import requests as requests_router
+from app.routers.requests import RESUBMIT_WINDOW
+
+from conftest import new_phone
+
+
+def _set_columns(request_id: int, **values) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(update(HelpRequest).where(HelpRequest.id == request_id).values(**values))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _request_body(**overrides) -> dict:
+    body = {
+        "help_type": "food",
+        "description": "Need food for a family of four",
+        "urgency": "moderate",
+        "latitude": 17.385,
+        "longitude": 78.4867,
+        "address": "Near the bus stand",
+    }
+    body.update(overrides)
+    return body
+
+
+def test_lost_accept_returns_409(client, make_helper, monkeypatch):
+    request_id = client.post("/api/requests/", json=_request_body()).json()["id"]
+    winner, loser = make_helper("Winner"), make_helper("Loser")
+    
+    # The winner's accept commits after the loser's status check but before
+    # its guarded UPDATE
+    get_helper = requests_router._get_helper
+    
+    def get_helper_after_competing_accept(db, helper_id):
+        other = SessionLocal()
+        try:
+            other.execute(
+                update(HelpRequest).where(HelpRequest.id == request_id)
+                .values(status="accepted", helper_id=winner)
+            )
+            other.commit()
+        finally:
+            other.close()
+        return get_helper(db, helper_id)
+    
+    monkeypatch.setattr(requests_router, "_get_helper", get_helper_after_competing_accept)
+    r = client.post(f"/api/requests/{request_id}/accept", params={"helper_id": loser})
+    monkeypatch.undo()
+    
+    assert r.status_code == 409, r.text
+    stored = client.get(f"/api/requests/{request_id}").json()
+    assert stored["status"] == "accepted"
+    assert stored["helper_id"] == winner
+
+
+def test_resubmission_with_phone_returns_existing(client):
+    body = _request_body(phone=new_phone(), latitude=12.9716, longitude=77.5946)
+    
+    first = client.post("/api/requests/", json=body)
+    again = client.post("/api/requests/", json=body)
+    
+    assert first.status_code == 201, first.text
+    assert again.status_code == 200, again.text
+    assert again.json()["id"] == first.json()["id"]
+
+
+def test_concurrent_resubmissions_store_one(client):
+    body = _request_body(phone=new_phone(), latitude=13.0827, longitude=80.2707)
+    
+    with ThreadPoolExecutor(4) as pool:
+        responses = list(pool.map(lambda _: client.post("/api/requests/", json=body), range(4)))
+    
+    assert sorted(r.status_code for r in responses) == [200, 200, 200, 201]
+    assert len({r.json()["id"] for r in responses}) == 1
+
+
+def test_phoneless_submissions_not_merged(client):
+    # Two different people, same spot, same (empty) text, no phone
+    body = _request_body(description="", latitude=19.076, longitude=72.8777)
+    
+    first = client.post("/api/requests/", json=body)
+    second = client.post("/api/requests/", json=body)
+    
+    assert first.status_code == 201, first.text
+    assert second.status_code == 201, second.text
+    assert second.json()["id"] != first.json()["id"]
+
+
+def test_resubmission_after_close_creates_new(client):
+    for status in ("completed", "cancelled"):
+        body = _request_body(phone=new_phone(), latitude=22.5726, longitude=88.3639)
+        first = client.post("/api/requests/", json=body).json()["id"]
+        _set_columns(first, status=status)
+        
+        again = client.post("/api/requests/", json=body)
+        
+        assert again.status_code == 201, again.text
+        assert again.json()["id"] != first
+
+
+def test_same_text_after_window_creates_new(client):
+    body = _request_body(phone=new_phone(), latitude=18.5204, longitude=73.8567)
+    first = client.post("/api/requests/", json=body).json()["id"]
+    # Still open, but older than the resubmission window
+    _set_columns(first, created_at=datetime.utcnow() - RESUBMIT_WINDOW - timedelta(minutes=1))
+    
+    second = client.post("/api/requests/", json=body)
+    third = client.post("/api/requests/", json=body)
+    
+    assert second.status_code == 201, second.text
+    assert second.json()["id"] != first
+    assert third.status_code == 200, third.text
+    assert third.json()["id"] == second.json()["id"]